@@ -1,6 +1,18 @@
 import tkinter as tk
 from tkinter import ttk
 import math
+import hashlib
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # numpy optionnel : on garde les boucles Python
+    np = None
+
+from Bezier import _bbox, _bbox_dist_sq, _flatness_sq, bezier_point, bezier_polyline_adaptive, draw_polyline_on_canvas, split_bezier
 
 # ============================================================
 # Cox–de–Boor (Bases B-Spline) + NURBS
@@ -77,31 +89,998 @@ def N_ip(i: int, p: int, t: float, U):
 
     return left + right
 
+def find_span(nb_ctrl: int, p: int, t: float, U):
+    """
+    Indice k du span tel que U[k] <= t < U[k+1] (recherche dichotomique).
+    t >= U[nb_ctrl] -> dernier span (nb_ctrl - 1), comme N_ip au dernier noeud.
+    """
+    n = nb_ctrl - 1
+    if t >= U[n + 1]:
+        return n
+    if t < U[p]:
+        return p
+
+    low = p
+    high = n + 1
+    mid = (low + high) // 2
+    while t < U[mid] or t >= U[mid + 1]:
+        if t < U[mid]:
+            high = mid
+        else:
+            low = mid
+        mid = (low + high) // 2
+    return mid
+
+def basis_funs(span: int, t: float, p: int, U):
+    """
+    Les p+1 fonctions non nulles N[span-p .. span] en t (schéma triangulaire,
+    sans récursion). Même consigne que N_ip : division par 0 -> contribue 0.
+    """
+    N = [1.0] + [0.0] * p
+    left = [0.0] * (p + 1)
+    right = [0.0] * (p + 1)
+    for j in range(1, p + 1):
+        left[j] = t - U[span + 1 - j]
+        right[j] = U[span + j] - t
+        saved = 0.0
+        for r in range(j):
+            denom = right[r + 1] + left[j - r]
+            temp = N[r] / denom if denom != 0 else 0.0  # consigne
+            N[r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        N[j] = saved
+    return N
+
+def nonzero_basis(nb_ctrl: int, p: int, t: float, U):
+    """
+    (span, N) : N[j] = N_{span-p+j, p}(t) pour j in [0..p].
+    Les autres fonctions de base sont nulles en t.
+    Coût O(p²) au lieu de O(nb_ctrl * 2^p) avec N_ip.
+    """
+    span = find_span(nb_ctrl, p, t, U)
+    return span, basis_funs(span, t, p, U)
+
 def bspline_point(points, p: int, t: float, U):
     x = 0.0
     y = 0.0
-    nb = len(points)
-    for i in range(nb):
-        b = N_ip(i, p, t, U)
-        x += points[i][0] * b
-        y += points[i][1] * b
+    span, N = nonzero_basis(len(points), p, t, U)
+    for j in range(p + 1):
+        b = N[j]
+        pt = points[span - p + j]
+        x += pt[0] * b
+        y += pt[1] * b
     return (x, y)
 
 def nurbs_point(points, weights, p: int, t: float, U):
     numx = 0.0
     numy = 0.0
     denom = 0.0
-    nb = len(points)
-    for i in range(nb):
-        b = N_ip(i, p, t, U)
-        w = weights[i]
-        numx += points[i][0] * b * w
-        numy += points[i][1] * b * w
-        denom += b * w
+    span, N = nonzero_basis(len(points), p, t, U)
+    for j in range(p + 1):
+        i = span - p + j
+        bw = N[j] * weights[i]
+        numx += points[i][0] * bw
+        numy += points[i][1] * bw
+        denom += bw
     if denom == 0:
         return None
     return (numx / denom, numy / denom)
 
+# ============================================================
+# Matrice de base creuse (bande) mise en cache
+# Une ligne par échantillon : span + les p+1 valeurs non nulles.
+# Ne dépend que de (U, p, nb_seg) -> partagée entre courbes et
+# entre redessins (LRU bornée).
+# ============================================================
+
+BASIS_CACHE_SIZE = 16
+_basis_cache = OrderedDict()
+
+def sample_params(U, p: int, nb_seg: int):
+    """Grille t_s = U[p] + (U[nb_ctrl] - U[p]) * s / nb_seg, s in [0..nb_seg]."""
+    nb_ctrl = len(U) - p - 1
+    t0 = U[p]
+    t1 = U[nb_ctrl]
+    return [t0 + (t1 - t0) * (s / nb_seg) for s in range(nb_seg + 1)]
+
+def _basis_funs_array(ts, p: int, U):
+    """
+    Version numpy de nonzero_basis sur un tableau de t :
+    spans (S,) et N (S, p+1).
+    """
+    Ua = np.asarray(U, dtype=float)
+    ts = np.asarray(ts, dtype=float)
+    n = len(U) - p - 2
+    # U[k] <= t < U[k+1], borné au domaine [p .. n]
+    spans = np.clip(np.searchsorted(Ua, ts, side="right") - 1, p, n)
+
+    S = len(ts)
+    N = np.zeros((S, p + 1))
+    N[:, 0] = 1.0
+    left = np.zeros((S, p + 1))
+    right = np.zeros((S, p + 1))
+    for j in range(1, p + 1):
+        left[:, j] = ts - Ua[spans + 1 - j]
+        right[:, j] = Ua[spans + j] - ts
+        saved = np.zeros(S)
+        for r in range(j):
+            denom = right[:, r + 1] + left[:, j - r]
+            safe = np.where(denom != 0, denom, 1.0)
+            temp = np.where(denom != 0, N[:, r] / safe, 0.0)  # consigne
+            N[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        N[:, j] = saved
+    return spans, N
+
+def basis_matrix(U, p: int, nb_seg: int):
+    """
+    Matrice de base en bande pour la grille sample_params(U, p, nb_seg) :
+    (spans, N) avec N[s][j] = N_{spans[s]-p+j, p}(t_s).
+    Tableaux numpy si disponible, sinon listes. Mise en cache (LRU).
+    """
+    key = (tuple(U), p, nb_seg)
+    hit = _basis_cache.get(key)
+    if hit is not None:
+        _basis_cache.move_to_end(key)
+        return hit
+
+    ts = sample_params(U, p, nb_seg)
+    nb_ctrl = len(U) - p - 1
+    if np is not None:
+        spans, N = _basis_funs_array(ts, p, U)
+        spans.setflags(write=False)
+        N.setflags(write=False)
+        hit = (spans, N)
+    else:
+        spans = []
+        N = []
+        for t in ts:
+            span, row = nonzero_basis(nb_ctrl, p, t, U)
+            spans.append(span)
+            N.append(row)
+        hit = (spans, N)
+
+    _basis_cache[key] = hit
+    if len(_basis_cache) > BASIS_CACHE_SIZE:
+        _basis_cache.popitem(last=False)
+    return hit
+
+def bspline_polyline(points, p: int, U, nb_seg: int):
+    """Courbe échantillonnée (nb_seg + 1 points) : produit matrice creuse x points."""
+    spans, N = basis_matrix(U, p, nb_seg)
+    if np is not None:
+        P = np.asarray(points, dtype=float)
+        idx = spans[:, None] - p + np.arange(p + 1)
+        coords = np.einsum("sj,sjd->sd", N, P[idx]).ravel().tolist()
+        return list(zip(coords[0::2], coords[1::2]))
+
+    pts = []
+    for span, row in zip(spans, N):
+        x = 0.0
+        y = 0.0
+        for j in range(p + 1):
+            pt = points[span - p + j]
+            x += pt[0] * row[j]
+            y += pt[1] * row[j]
+        pts.append((x, y))
+    return pts
+
+def nurbs_polyline(points, weights, p: int, U, nb_seg: int):
+    """
+    NURBS échantillonnée : numérateur et dénominateur pondérés avec la même
+    matrice de base. Les échantillons de dénominateur nul sont ignorés.
+    """
+    spans, N = basis_matrix(U, p, nb_seg)
+    if np is not None:
+        P = np.asarray(points, dtype=float)
+        Wt = np.asarray(weights, dtype=float)
+        idx = spans[:, None] - p + np.arange(p + 1)
+        NW = N * Wt[idx]
+        den = NW.sum(axis=1)
+        num = np.einsum("sj,sjd->sd", NW, P[idx])
+        ok = den != 0
+        coords = (num[ok] / den[ok, None]).ravel().tolist()
+        return list(zip(coords[0::2], coords[1::2]))
+
+    pts = []
+    for span, row in zip(spans, N):
+        numx = 0.0
+        numy = 0.0
+        denom = 0.0
+        for j in range(p + 1):
+            i = span - p + j
+            bw = row[j] * weights[i]
+            numx += points[i][0] * bw
+            numy += points[i][1] * bw
+            denom += bw
+        if denom != 0:
+            pts.append((numx / denom, numy / denom))
+    return pts
+
+# ============================================================
+# Mise à jour locale (support local)
+# Le point de contrôle i n'agit que sur [U[i], U[i+p+1]) :
+# seuls les échantillons dont le span est dans [i .. i+p] changent.
+# ============================================================
+
+def affected_range(U, p: int, nb_seg: int, i: int):
+    """Échantillons [s0, s1) de la grille touchés par le point de contrôle i."""
+    spans, _ = basis_matrix(U, p, nb_seg)
+    return bisect_left(spans, i), bisect_right(spans, i + p)
+
+def update_samples(samples, points, weights, p: int, U, nb_seg: int, i: int):
+    """
+    Recalcule en place samples[s0:s1] après modification du point (ou poids) i.
+    samples : les nb_seg + 1 points de bspline_polyline / nurbs_polyline
+    (weights=None -> B-spline, sinon NURBS à poids > 0).
+    Retourne (s0, s1).
+    """
+    spans, N = basis_matrix(U, p, nb_seg)
+    s0, s1 = affected_range(U, p, nb_seg, i)
+    rows = N[s0:s1]
+    if np is not None:
+        rows = rows.tolist()
+    for s, row in zip(range(s0, s1), rows):
+        base = int(spans[s]) - p
+        x = 0.0
+        y = 0.0
+        denom = 0.0
+        for j in range(p + 1):
+            pt = points[base + j]
+            b = row[j] if weights is None else row[j] * weights[base + j]
+            x += pt[0] * b
+            y += pt[1] * b
+            denom += b
+        if weights is None:
+            samples[s] = (x, y)
+        elif denom != 0:
+            samples[s] = (x / denom, y / denom)
+    return s0, s1
+
+# ============================================================
+# Extraction de Bézier (insertion de noeuds de Boehm)
+# Chaque noeud du domaine est inséré jusqu'à multiplicité p :
+# la courbe devient une suite de Bézier (rationnelles) de degré p,
+# une par span non vide. Calcul en coordonnées homogènes (wx, wy, w).
+# ============================================================
+
+BEZIER_CACHE_SIZE = 64
+_bezier_cache = OrderedDict()
+
+def insert_knot(Pw, p: int, U, t: float):
+    """
+    Insère une fois le noeud t (algorithme de Boehm).
+    Pw : points homogènes (wx, wy, w), U : vecteur de noeuds.
+    Retourne (Pw', U') avec un point et un noeud de plus ; la courbe ne change pas.
+    ValueError si t est hors du domaine [U[p], U[n+1]] ou déjà de multiplicité
+    p (ou plus, ex. bout d'un vecteur ouvert) : la forme ne serait plus gardée.
+    """
+    n = len(Pw) - 1
+    if t < U[p] or t > U[n + 1]:
+        raise ValueError("insert_knot: t outside the curve domain")
+    if bisect_right(U, t) - bisect_left(U, t) >= p:
+        raise ValueError("insert_knot: knot already has multiplicity p")
+    # span [U[k], U[k+1]] contenant t, non vide -> dénominateurs jamais nuls
+    if t < U[n + 1]:
+        k = bisect_right(U, t) - 1
+    else:
+        k = bisect_left(U, t) - 1
+    Q = list(Pw[:k - p + 1])
+    for i in range(k - p + 1, k + 1):
+        a = (t - U[i]) / (U[i + p] - U[i])
+        P0 = Pw[i - 1]
+        P1 = Pw[i]
+        Q.append((a * P1[0] + (1 - a) * P0[0], a * P1[1] + (1 - a) * P0[1], a * P1[2] + (1 - a) * P0[2]))
+    Q.extend(Pw[k:])
+    return Q, list(U[:k + 1]) + [t] + list(U[k + 1:])
+
+def insert_knot_curve(points, weights, p: int, U, t: float):
+    """
+    Insère le noeud t dans la courbe sans changer sa forme.
+    Retourne (points, poids, U) ; weights=None -> B-spline (poids None en sortie).
+    """
+    if weights is None:
+        Pw = [(x, y, 1.0) for x, y in points]
+    else:
+        Pw = [(x * w, y * w, w) for (x, y), w in zip(points, weights)]
+    Qw, V = insert_knot(Pw, p, U, t)
+    pts = [(P[0] / P[2], P[1] / P[2]) for P in Qw]
+    return pts, None if weights is None else [P[2] for P in Qw], V
+
+def decompose_bezier(points, weights, p: int, U):
+    """
+    Segments de Bézier de la courbe : liste de (u0, u1, ctrl) où ctrl contient
+    les p+1 points homogènes (wx, wy, w) du span [u0, u1].
+    weights=None -> B-spline (w = 1). Mis en cache (LRU) par contenu :
+    modifier points, poids ou noeuds donne une nouvelle entrée.
+    """
+    key = (tuple(points), None if weights is None else tuple(weights), p, tuple(U))
+    hit = _bezier_cache.get(key)
+    if hit is not None:
+        _bezier_cache.move_to_end(key)
+        return hit
+
+    nb_ctrl = len(points)
+    segs = []
+    if p >= 1 and nb_ctrl > p and len(U) == nb_ctrl + p + 1 and U[p] < U[nb_ctrl]:
+        if weights is None:
+            Pw = [(x, y, 1.0) for x, y in points]
+        else:
+            Pw = [(x * w, y * w, w) for (x, y), w in zip(points, weights)]
+        # span s ne dépend que de Pw[s-p .. s] et U[s-p .. s+p+1] : extraction
+        # locale (O(p²) par span) au lieu d'insertions dans toute la courbe
+        for s in range(p, nb_ctrl):
+            u0 = U[s]
+            u1 = U[s + 1]
+            if u0 == u1:
+                continue
+            Q = Pw[s - p:s + 1]
+            V = list(U[s - p:s + p + 2])
+            for u in (u0, u1):
+                while bisect_right(V, u) - bisect_left(V, u) < p:
+                    Q, V = insert_knot(Q, p, V, u)
+            # le span [u0, u1) du vecteur local -> Q[k-p .. k]
+            k = bisect_right(V, u0) - 1
+            segs.append((u0, u1, Q[k - p:k + 1]))
+
+    _bezier_cache[key] = segs
+    if len(_bezier_cache) > BEZIER_CACHE_SIZE:
+        _bezier_cache.popitem(last=False)
+    return segs
+
+def rational_bezier_point(ctrl, u: float):
+    """Point en u in [0, 1] (De Casteljau homogène), None si w = 0."""
+    x, y, w = bezier_point(ctrl, u)
+    if w == 0:
+        return None
+    return (x / w, y / w)
+
+# Pas de tracé uniforme par segments : la grille fixe (nurbs_polyline /
+# bspline_polyline, base bandée en cache) donne nb_seg + 1 points en u
+# réguliers, ce dont dépend le patch local pendant un drag (update_samples).
+# Les segments servent au mode adaptatif, au clic et à la projection.
+
+def _rational_bezier_ders(ctrl, u: float):
+    """(C, C', C'') du segment homogène en u (règle du quotient)."""
+    q = len(ctrl) - 1
+    d1 = [tuple(q * (b - a) for a, b in zip(P0, P1)) for P0, P1 in zip(ctrl, ctrl[1:])]
+    d2 = [tuple((q - 1) * (b - a) for a, b in zip(P0, P1)) for P0, P1 in zip(d1, d1[1:])]
+
+    # De Casteljau homogène (dérivée absente, degré < 2 -> 0)
+    A0 = bezier_point(ctrl, u)
+    A1 = bezier_point(d1, u) if d1 else (0.0, 0.0, 0.0)
+    A2 = bezier_point(d2, u) if d2 else (0.0, 0.0, 0.0)
+    w0, w1, w2 = A0[2], A1[2], A2[2]
+    c = (A0[0] / w0, A0[1] / w0)
+    c1 = ((A1[0] - w1 * c[0]) / w0, (A1[1] - w1 * c[1]) / w0)
+    c2 = ((A2[0] - 2 * w1 * c1[0] - w2 * c[0]) / w0, (A2[1] - 2 * w1 * c1[1] - w2 * c[1]) / w0)
+    return c, c1, c2
+
+def project_point(segs, x: float, y: float, radius: float = math.inf, iterations: int = 6,
+                  tolerance: float = 0.5, max_depth: int = 16):
+    """
+    Point de la courbe le plus proche de (x, y) à moins de radius.
+    Les segments sont coupés en deux (De Casteljau homogène, comme
+    bezier_polyline_adaptive) en visitant d'abord les morceaux dont la boîte
+    projetée est la plus proche, jusqu'à être plats à tolerance près.
+    Amorce = projection sur la corde de la feuille, puis Newton sur
+    f(u) = (C(u) - q) . C'(u), gardé seulement s'il rapproche.
+    Retourne (t, point, distance) ou None.
+    """
+    best = None
+    best_sq = radius * radius if radius != math.inf else math.inf
+    tol_sq = tolerance * tolerance
+    # noeud : (distance² à la boîte, compteur, segment, a, b, ctrl, ctrl projetés, profondeur)
+    heap = []
+    for k, (u0, u1, ctrl) in enumerate(segs):
+        flat = [_dehomogenize(P) for P in ctrl]
+        heap.append((_bbox_dist_sq(_bbox(flat), x, y), k, k, 0.0, 1.0, ctrl, flat, 0))
+    heapq.heapify(heap)
+    counter = len(heap)
+
+    while heap:
+        d_sq, _, k, a, b, piece, flat, depth = heapq.heappop(heap)
+        # poids > 0 : le morceau est dans sa boîte, rien de plus proche après
+        if d_sq > best_sq:
+            break
+        if depth < max_depth and _flatness_sq(flat) > tol_sq:
+            am = 0.5 * (a + b)
+            for part, lo, hi in zip(split_bezier(piece), (a, am), (am, b)):
+                pflat = [_dehomogenize(P) for P in part]
+                heapq.heappush(heap, (_bbox_dist_sq(_bbox(pflat), x, y), counter, k, lo, hi, part, pflat, depth + 1))
+                counter += 1
+            continue
+
+        # feuille plate : amorce sur sa corde
+        u0, u1, ctrl = segs[k]
+        (ax, ay), (bx, by) = flat[0], flat[-1]
+        vx, vy = bx - ax, by - ay
+        L = vx * vx + vy * vy
+        s = 0.0 if L == 0 else min(1.0, max(0.0, ((x - ax) * vx + (y - ay) * vy) / L))
+        seed = a + s * (b - a)
+        u = seed
+        for _ in range(iterations):
+            (px, py), (d1x, d1y), (d2x, d2y) = _rational_bezier_ders(ctrl, u)
+            ex, ey = px - x, py - y
+            f = ex * d1x + ey * d1y
+            df = d1x * d1x + d1y * d1y + ex * d2x + ey * d2y
+            if df <= 0.0:
+                break
+            nu = min(1.0, max(0.0, u - f / df))
+            if abs(nu - u) < 1e-9:
+                u = nu
+                break
+            u = nu
+        for cand in (seed, u):
+            pt = rational_bezier_point(ctrl, cand)
+            e = (pt[0] - x) ** 2 + (pt[1] - y) ** 2
+            if e <= best_sq:
+                best_sq = e
+                best = (u0 + cand * (u1 - u0), pt, math.sqrt(e))
+    return best
+
+# ============================================================
+# Tessellation adaptative par span
+# Chaque segment de Bézier (donc chaque span non vide, les spans de
+# longueur nulle disparaissent) est coupé en deux tant que ses points de
+# contrôle projetés s'écartent de la corde de plus de la tolérance.
+# Poids > 0 : la courbe reste dans leur enveloppe convexe.
+# ============================================================
+
+def _dehomogenize(P):
+    """(wx, wy, w) -> (x, y)."""
+    return (P[0] / P[2], P[1] / P[2])
+
+def adaptive_polyline(segs, tolerance: float = 0.5, max_depth: int = 12):
+    """
+    Polyligne de la courbe à tolérance de corde `tolerance` (pixels) :
+    peu de points sur les parties droites, plus là où la courbe (ou un
+    poids élevé) la fait tourner. Même subdivision que Bézier
+    (bezier_polyline_adaptive), sur les points homogènes.
+    """
+    if tolerance <= 0:
+        raise ValueError("adaptive_polyline: tolerance must be > 0")
+    pts = []
+    for _, _, ctrl in segs:
+        part = bezier_polyline_adaptive(ctrl, tolerance, max_depth, project=_dehomogenize)
+        # le premier point d'un span = dernier point du précédent
+        pts.extend(part[1:] if pts else part)
+    return pts
+
+# ============================================================
+# Dérivées (NURBS Book A2.3)
+# Les fonctions de base et leurs dérivées sortent du même tableau
+# triangulaire ndu : point, C' et C'' en une passe, sans différences finies.
+# NURBS : règle du quotient sur A(t) = sum N w P et w(t) = sum N w.
+# ============================================================
+
+def ders_basis_funs(span: int, t: float, p: int, U, n: int = 2):
+    """
+    ders[k][j] = dérivée k-ième de N_{span-p+j, p} en t, k in [0..n].
+    Même consigne que N_ip : division par 0 -> contribue 0.
+    """
+    ndu = [[0.0] * (p + 1) for _ in range(p + 1)]
+    ndu[0][0] = 1.0
+    left = [0.0] * (p + 1)
+    right = [0.0] * (p + 1)
+    for j in range(1, p + 1):
+        left[j] = t - U[span + 1 - j]
+        right[j] = U[span + j] - t
+        saved = 0.0
+        for r in range(j):
+            # triangle inférieur : écarts de noeuds
+            ndu[j][r] = right[r + 1] + left[j - r]
+            temp = ndu[r][j - 1] / ndu[j][r] if ndu[j][r] != 0 else 0.0
+            # triangle supérieur : fonctions de base
+            ndu[r][j] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        ndu[j][j] = saved
+
+    ders = [[0.0] * (p + 1) for _ in range(n + 1)]
+    for j in range(p + 1):
+        ders[0][j] = ndu[j][p]
+
+    def div(a, b):
+        return a / b if b != 0 else 0.0  # consigne
+
+    # au-delà de p les dérivées sont nulles
+    top = min(n, p)
+    for r in range(p + 1):
+        s1 = 0
+        s2 = 1
+        a = [[0.0] * (p + 1) for _ in range(2)]
+        a[0][0] = 1.0
+        for k in range(1, top + 1):
+            d = 0.0
+            rk = r - k
+            pk = p - k
+            if r >= k:
+                a[s2][0] = div(a[s1][0], ndu[pk + 1][rk])
+                d = a[s2][0] * ndu[rk][pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2][j] = div(a[s1][j] - a[s1][j - 1], ndu[pk + 1][rk + j])
+                d += a[s2][j] * ndu[rk + j][pk]
+            if r <= pk:
+                a[s2][k] = div(-a[s1][k - 1], ndu[pk + 1][r])
+                d += a[s2][k] * ndu[r][pk]
+            ders[k][r] = d
+            s1, s2 = s2, s1
+
+    # facteurs p, p(p-1), ...
+    f = p
+    for k in range(1, top + 1):
+        for j in range(p + 1):
+            ders[k][j] *= f
+        f *= p - k
+    return ders
+
+def _ders_basis_funs_array(ts, p: int, U):
+    """
+    Version numpy de ders_basis_funs (n = 2) sur un tableau de t :
+    spans (S,) et ders (3, p+1, S).
+    """
+    Ua = np.asarray(U, dtype=float)
+    ts = np.asarray(ts, dtype=float)
+    n = len(U) - p - 2
+    spans = np.clip(np.searchsorted(Ua, ts, side="right") - 1, p, n)
+
+    S = len(ts)
+
+    def div(a, b):
+        safe = np.where(b != 0, b, 1.0)
+        return np.where(b != 0, a / safe, 0.0)  # consigne
+
+    ndu = np.zeros((p + 1, p + 1, S))
+    ndu[0, 0] = 1.0
+    left = np.zeros((p + 1, S))
+    right = np.zeros((p + 1, S))
+    for j in range(1, p + 1):
+        left[j] = ts - Ua[spans + 1 - j]
+        right[j] = Ua[spans + j] - ts
+        saved = np.zeros(S)
+        for r in range(j):
+            ndu[j, r] = right[r + 1] + left[j - r]
+            temp = div(ndu[r, j - 1], ndu[j, r])
+            ndu[r, j] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        ndu[j, j] = saved
+
+    ders = np.zeros((3, p + 1, S))
+    ders[0] = ndu[:, p]
+    top = min(2, p)
+    for r in range(p + 1):
+        a = np.zeros((2, p + 1, S))
+        a[0, 0] = 1.0
+        s1 = 0
+        s2 = 1
+        for k in range(1, top + 1):
+            d = np.zeros(S)
+            rk = r - k
+            pk = p - k
+            if r >= k:
+                a[s2, 0] = div(a[s1, 0], ndu[pk + 1, rk])
+                d = a[s2, 0] * ndu[rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2, j] = div(a[s1, j] - a[s1, j - 1], ndu[pk + 1, rk + j])
+                d = d + a[s2, j] * ndu[rk + j, pk]
+            if r <= pk:
+                a[s2, k] = div(-a[s1, k - 1], ndu[pk + 1, r])
+                d = d + a[s2, k] * ndu[r, pk]
+            ders[k, r] = d
+            s1, s2 = s2, s1
+
+    f = p
+    for k in range(1, top + 1):
+        ders[k] *= f
+        f *= p - k
+    return spans, ders
+
+def curve_derivatives(points, weights, p: int, U, ts):
+    """
+    (C, C', C'') pour chaque t de ts : trois listes de (x, y) alignées sur ts.
+    weights=None -> B-spline, sinon NURBS (dénominateur nul -> point ignoré
+    dans les trois listes).
+    """
+    nb_ctrl = len(points)
+    if weights is None:
+        Pw = [(x, y, 1.0) for x, y in points]
+    else:
+        Pw = [(x * w, y * w, w) for (x, y), w in zip(points, weights)]
+
+    if np is not None:
+        spans, ders = _ders_basis_funs_array(ts, p, U)
+        H = np.asarray(Pw, dtype=float)[spans[:, None] - p + np.arange(p + 1)]   # (S, p+1, 3)
+        A = np.einsum("kjs,sjd->ksd", ders, H)                                    # (3, S, 3)
+        w0, w1, w2 = A[0, :, 2:], A[1, :, 2:], A[2, :, 2:]
+        ok = w0[:, 0] != 0
+        w0 = np.where(w0 != 0, w0, 1.0)
+        C = A[0, :, :2] / w0
+        C1 = (A[1, :, :2] - w1 * C) / w0
+        C2 = (A[2, :, :2] - 2 * w1 * C1 - w2 * C) / w0
+        out = []
+        for M in (C, C1, C2):
+            coords = M[ok].ravel().tolist()
+            out.append(list(zip(coords[0::2], coords[1::2])))
+        return tuple(out)
+
+    C = []
+    C1 = []
+    C2 = []
+    for t in ts:
+        span = find_span(nb_ctrl, p, t, U)
+        ders = ders_basis_funs(span, t, p, U, 2)
+        A = [[0.0, 0.0, 0.0] for _ in range(3)]
+        for k in range(3):
+            for j in range(p + 1):
+                P = Pw[span - p + j]
+                b = ders[k][j]
+                A[k][0] += P[0] * b
+                A[k][1] += P[1] * b
+                A[k][2] += P[2] * b
+        w0, w1, w2 = A[0][2], A[1][2], A[2][2]
+        if w0 == 0:
+            continue
+        c = (A[0][0] / w0, A[0][1] / w0)
+        c1 = ((A[1][0] - w1 * c[0]) / w0, (A[1][1] - w1 * c[1]) / w0)
+        c2 = (
+            (A[2][0] - 2 * w1 * c1[0] - w2 * c[0]) / w0,
+            (A[2][1] - 2 * w1 * c1[1] - w2 * c[1]) / w0,
+        )
+        C.append(c)
+        C1.append(c1)
+        C2.append(c2)
+    return C, C1, C2
+
+def curvature(d1, d2):
+    """Courbure signée à partir de C' et C'' (0 si C' nul)."""
+    den = (d1[0] * d1[0] + d1[1] * d1[1]) ** 1.5
+    if den == 0:
+        return 0.0
+    return (d1[0] * d2[1] - d1[1] * d2[0]) / den
+
+# ============================================================
+# Interpolation globale (NURBS Book 9.2.1)
+# Paramètres centripètes / longueur de corde, noeuds moyennés, puis
+# système de collocation N(ū_k) P = Q_k : chaque ligne n'a que p+1
+# termes non nuls consécutifs -> élimination en bande O(n p²).
+# Matrice totalement positive : pas besoin de pivot.
+# ============================================================
+
+def interpolation_params(points, method: str = "centripetal"):
+    """ū_k dans [0, 1] : cumul de |Q_k - Q_k-1| (chord) ou de sa racine (centripetal)."""
+    if method not in ("centripetal", "chord"):
+        raise ValueError("interpolation_params: method must be 'centripetal' or 'chord'")
+    n = len(points) - 1
+    steps = []
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        d = math.hypot(x1 - x0, y1 - y0)
+        steps.append(math.sqrt(d) if method == "centripetal" else d)
+    total = sum(steps)
+    if total == 0:
+        # tous les points confondus -> paramètres uniformes
+        return [k / n for k in range(n + 1)] if n > 0 else [0.0]
+    params = [0.0]
+    acc = 0.0
+    for d in steps[:-1]:
+        acc += d
+        params.append(acc / total)
+    params.append(1.0)
+    return params
+
+def averaged_knots(params, p: int):
+    """Noeuds moyennés : p+1 zéros, u_(j+p) = moyenne de ū_j .. ū_(j+p-1), p+1 uns."""
+    n = len(params) - 1
+    U = [0.0] * (p + 1)
+    acc = sum(params[1:p + 1])
+    for j in range(1, n - p + 1):
+        U.append(acc / p)
+        acc += params[j + p] - params[j]
+    U += [1.0] * (p + 1)
+    return U
+
+def solve_banded(rows, starts, rhs):
+    """
+    Résout A X = B pour A en bande, sans pivot.
+    rows[k] : termes non nuls de la ligne k à partir de la colonne starts[k]
+    (starts non décroissant). rhs[k] : liste de valeurs (une par colonne de B).
+    Retourne X (liste de listes). ValueError si un pivot est nul.
+    """
+    n = len(rows)
+    rows = [list(r) for r in rows]
+    lo = list(starts)
+    b = [list(v) for v in rhs]
+    dim = len(b[0]) if b else 0
+
+    for i in range(n):
+        ri = rows[i]
+        off = i - lo[i]
+        piv = ri[off] if 0 <= off < len(ri) else 0.0
+        if piv == 0:
+            raise ValueError("solve_banded: zero pivot")
+        hi = lo[i] + len(ri)
+        bi = b[i]
+        r = i + 1
+        # lignes suivantes qui ont encore un terme en colonne i
+        while r < n and lo[r] <= i:
+            rr = rows[r]
+            base = lo[r]
+            f = rr[i - base] / piv if i - base < len(rr) else 0.0
+            if f != 0:
+                need = hi - (base + len(rr))
+                if need > 0:
+                    rr.extend([0.0] * need)
+                for c in range(i + 1, hi):
+                    rr[c - base] -= f * ri[c - lo[i]]
+                br = b[r]
+                for d in range(dim):
+                    br[d] -= f * bi[d]
+            rows[r] = rr[i + 1 - base:]
+            lo[r] = i + 1
+            r += 1
+
+    # remontée (triangulaire supérieure, largeur <= p + 1)
+    X = [None] * n
+    for i in range(n - 1, -1, -1):
+        ri = rows[i]
+        base = lo[i]
+        acc = list(b[i])
+        for c in range(i + 1, base + len(ri)):
+            a = ri[c - base]
+            if a != 0:
+                xc = X[c]
+                for d in range(dim):
+                    acc[d] -= a * xc[d]
+        piv = ri[i - base]
+        X[i] = [v / piv for v in acc]
+    return X
+
+def interpolate_curve(points, p: int = 3, method: str = "centripetal"):
+    """
+    B-spline de degré p passant par tous les points :
+    retourne (ctrl, U), un point de contrôle par point distinct, U de longueur
+    len(ctrl) + p + 1. Les doublons consécutifs sont retirés (système singulier
+    sinon) et le degré ramené à len(ctrl) - 1 s'il y a trop peu de points.
+    """
+    points = [pt for k, pt in enumerate(points) if k == 0 or pt != points[k - 1]]
+    nb = len(points)
+    if nb < 2:
+        raise ValueError("interpolate_curve: at least 2 points are needed")
+    p = max(1, min(p, nb - 1))
+    params = interpolation_params(points, method)
+    U = averaged_knots(params, p)
+
+    if np is not None:
+        spans, N = _basis_funs_array(params, p, U)
+        spans = spans.tolist()
+        N = N.tolist()
+    else:
+        spans = []
+        N = []
+        for t in params:
+            span, row = nonzero_basis(nb, p, t, U)
+            spans.append(span)
+            N.append(row)
+
+    starts = [span - p for span in spans]
+    X = solve_banded(N, starts, [list(pt) for pt in points])
+    return [(x, y) for x, y in X], U
+
+# ============================================================
+# Approximation aux moindres carrés (NURBS Book 9.4.1)
+# Extrémités fixées, points intérieurs solution de (NᵀN) P = Nᵀ R.
+# NᵀN est en bande (largeur 2p+1) : on l'accumule directement en bande
+# à partir des p+1 valeurs non nulles de chaque ligne de N.
+# ============================================================
+
+def approximation_knots(params, p: int, nb_ctrl: int):
+    """Noeuds de 9.69 : chaque span reçoit à peu près le même nombre de paramètres."""
+    m = len(params) - 1
+    n = nb_ctrl - 1
+    d = (m + 1) / (n - p + 1)
+    U = [0.0] * (p + 1)
+    for j in range(1, n - p + 1):
+        i = int(j * d)
+        a = j * d - i
+        U.append((1 - a) * params[i - 1] + a * params[i])
+    U += [1.0] * (p + 1)
+    return U
+
+def _lsq_fit(points, params, p: int, U):
+    """
+    Points de contrôle (len(U) - p - 1) ajustant points aux paramètres params,
+    premier et dernier points de contrôle = premier et dernier points.
+    Retourne (ctrl, spans, N) ; spans / N servent à mesurer l'erreur.
+    """
+    nb_ctrl = len(U) - p - 1
+    n = nb_ctrl - 1
+    width = 2 * p + 1
+
+    if np is not None:
+        spans, N = _basis_funs_array(params, p, U)
+        Q = np.asarray(points, dtype=float)
+        # M[r, p + c - r] = sum_s N_r(ū_s) N_c(ū_s)
+        M = np.zeros((nb_ctrl, width))
+        B = np.zeros((nb_ctrl, 2))
+        cols = spans[:, None] - p + np.arange(p + 1)
+        for a in range(p + 1):
+            for b in range(p + 1):
+                np.add.at(M, (cols[:, a], p + b - a), N[:, a] * N[:, b])
+            np.add.at(B, cols[:, a], N[:, a:a + 1] * Q)
+        M = M.tolist()
+        B = B.tolist()
+    else:
+        spans = []
+        N = []
+        M = [[0.0] * width for _ in range(nb_ctrl)]
+        B = [[0.0, 0.0] for _ in range(nb_ctrl)]
+        for t, (x, y) in zip(params, points):
+            span, row = nonzero_basis(nb_ctrl, p, t, U)
+            spans.append(span)
+            N.append(row)
+            for a in range(p + 1):
+                r = span - p + a
+                for b in range(p + 1):
+                    M[r][p + b - a] += row[a] * row[b]
+                B[r][0] += row[a] * x
+                B[r][1] += row[a] * y
+
+    P0 = points[0]
+    Pn = points[-1]
+    if n <= 1:
+        return [P0, Pn][:nb_ctrl], spans, N
+
+    # inconnues 1 .. n-1 : on retire la contribution des extrémités fixées
+    rows = []
+    starts = []
+    rhs = []
+    for r in range(1, n):
+        c0 = max(1, r - p)
+        c1 = min(n - 1, r + p)
+        rows.append(M[r][p + c0 - r:p + c1 - r + 1])
+        starts.append(c0 - 1)
+        bx, by = B[r]
+        if r - p <= 0:
+            m0 = M[r][p - r]
+            bx -= m0 * P0[0]
+            by -= m0 * P0[1]
+        if r + p >= n:
+            mn = M[r][p + n - r]
+            bx -= mn * Pn[0]
+            by -= mn * Pn[1]
+        rhs.append([bx, by])
+    X = solve_banded(rows, starts, rhs)
+    return [tuple(P0)] + [(x, y) for x, y in X] + [tuple(Pn)], spans, N
+
+def _fit_errors(ctrl, points, p: int, spans, N):
+    """Distance de chaque point à la courbe au paramètre qui lui est associé."""
+    if np is not None:
+        P = np.asarray(ctrl, dtype=float)
+        idx = np.asarray(spans)[:, None] - p + np.arange(p + 1)
+        C = np.einsum("sj,sjd->sd", np.asarray(N), P[idx])
+        return np.hypot(*(C - np.asarray(points, dtype=float)).T).tolist()
+    errs = []
+    for span, row, (qx, qy) in zip(spans, N, points):
+        x = 0.0
+        y = 0.0
+        for j in range(p + 1):
+            pt = ctrl[span - p + j]
+            x += pt[0] * row[j]
+            y += pt[1] * row[j]
+        errs.append(math.hypot(x - qx, y - qy))
+    return errs
+
+def approximate_curve(points, p: int = 3, nb_ctrl: int = 20, method: str = "chord",
+                      tolerance=None, max_ctrl=None):
+    """
+    B-spline de degré p à nb_ctrl points de contrôle approchant un nuage de points
+    ordonné (moindres carrés, extrémités interpolées).
+    tolerance : si donnée, insère des noeuds (médiane des paramètres du span) là
+    où l'erreur la dépasse et réajuste, jusqu'à max_ctrl points de contrôle.
+    Retourne (ctrl, U, erreur max, erreur RMS).
+    """
+    points = [pt for k, pt in enumerate(points) if k == 0 or pt != points[k - 1]]
+    if len(points) < 2:
+        raise ValueError("approximate_curve: at least 2 distinct points are needed")
+    nb_ctrl = max(2, min(nb_ctrl, len(points)))
+    p = max(1, min(p, nb_ctrl - 1))
+    if max_ctrl is None:
+        max_ctrl = len(points) // 2
+    max_ctrl = max(nb_ctrl, min(max_ctrl, len(points)))
+
+    params = interpolation_params(points, method)
+    U = approximation_knots(params, p, nb_ctrl)
+    while True:
+        ctrl, spans, N = _lsq_fit(points, params, p, U)
+        errs = _fit_errors(ctrl, points, p, spans, N)
+        if np is not None:
+            spans = spans.tolist()
+        worst = max(errs)
+        if tolerance is None or worst <= tolerance or len(ctrl) >= max_ctrl:
+            break
+
+        # un noeud au plus par span fautif : la médiane de ses paramètres
+        new_knots = []
+        s = 0
+        while s < len(spans):
+            e = s
+            bad = False
+            while e < len(spans) and spans[e] == spans[s]:
+                bad = bad or errs[e] > tolerance
+                e += 1
+            mid = (s + e) // 2
+            if bad and e - s >= 2 and params[mid - 1] < params[mid] and U[spans[s]] < params[mid]:
+                new_knots.append(params[mid])
+            s = e
+        new_knots = new_knots[:max_ctrl - len(ctrl)]
+        if not new_knots:
+            break
+        U = sorted(U + new_knots)
+
+    rms = math.sqrt(sum(e * e for e in errs) / len(errs))
+    return ctrl, U, worst, rms
+
+# ============================================================
+# Cache mémo des courbes évaluées
+# Clé = empreinte du contenu (points, poids, noeuds, p, échantillonnage,
+# mode) : une courbe inchangée (ou revenue à un état déjà vu, ex. slider
+# remis à une ancienne valeur) est une simple lecture.
+# Éviction LRU sur la taille estimée en octets.
+# ============================================================
+
+class CurveCache:
+    POINT_BYTES = 112   # tuple (x, y) de 2 floats + pointeur de liste
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # clé -> (points, octets)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(points, weights, U, p: int, spec, nurbs: bool):
+        """Empreinte 128 bits (blake2b) du contenu de la courbe et des réglages."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((len(points), None if weights is None else len(weights), len(U), p, spec, nurbs)).encode())
+        h.update(array("d", [c for pt in points for c in pt]).tobytes())
+        if weights is not None:
+            h.update(array("d", weights).tobytes())
+        h.update(array("d", U).tobytes())
+        return h.digest()
+
+    def get(self, key):
+        hit = self.entries.get(key)
+        if hit is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return hit[0]
+
+    def put(self, key, pts):
+        size = len(pts) * self.POINT_BYTES
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.entries[key] = (pts, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, old_size) = self.entries.popitem(last=False)
+            self.bytes -= old_size
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.bytes}
+
 # ============================================================
 # Fenêtre (même squelette que BezierWindow)
 # ============================================================
@@ -116,6 +1095,10 @@ class BSplineNURBSWindow(tk.Toplevel):
         self.all_curves = []          # list[list[(x,y)]]
         self.all_weights = []         # list[list[float]] alignée sur all_curves
         self.all_custom_knots = []    # list[None or list[float]] (un vecteur par courbe)
+        self.curve_items = []         # id de la ligne Tk de chaque courbe (None si pas de ligne)
+        self.all_samples = []         # None ou {"key", "pts", "local", "drawn"} par courbe
+        self.deco_items = {}          # c_idx -> ids Tk du polygone / des points (dernier redraw)
+        self.curve_cache = CurveCache()  # courbes évaluées, par contenu
         self.current_curve_idx = -1
         self.dragging_point = None    # (curve_idx, point_idx)
         self.dragging_offset = (0, 0)
@@ -123,6 +1106,8 @@ class BSplineNURBSWindow(tk.Toplevel):
         # Paramètres UI
         self.step = tk.DoubleVar(value=0.01)         # précision (comme Bézier)
         self.degree = tk.IntVar(value=3)             # p
+        self.use_adaptive = tk.BooleanVar(value=False)
+        self.tolerance = tk.DoubleVar(value=0.5)     # en pixels
         self.use_nurbs = tk.BooleanVar(value=False)  # toggle NURBS
         self.use_custom_knots = tk.BooleanVar(value=False)
         self.knots_text = tk.StringVar(value="")     # input custom knots
@@ -138,7 +1123,7 @@ class BSplineNURBSWindow(tk.Toplevel):
         top.pack(side="top", fill="x", pady=5)
 
         txt = (
-            "Souris : Clic Gauche (Point/Drag) | Clic Droit (Nouv. Courbe)  ||  "
+            "Souris : Clic Gauche (Point/Drag) | Ctrl+Clic (Insérer noeud) | Clic Droit (Nouv. Courbe)  ||  "
             "Delete (Suppr Point) | +/- (Poids NURBS) | Entrée (Appliquer noeuds)"
         )
         ttk.Label(top, text=txt).pack(side="left", padx=5)
@@ -146,6 +1131,7 @@ class BSplineNURBSWindow(tk.Toplevel):
         ttk.Button(top, text="Suppr Courbe", command=self.delete_current_curve).pack(side="left", padx=5)
         ttk.Button(top, text="Effacer Tout", command=self.clear_all).pack(side="left", padx=5)
         ttk.Button(top, text="Doubler Point", command=self.duplicate_point).pack(side="left", padx=5)
+        ttk.Button(top, text="Interpoler", command=self.interpolate_current_curve).pack(side="left", padx=5)
 
         ttk.Checkbutton(top, text="Mode NURBS (poids)", variable=self.use_nurbs, command=self.redraw).pack(side="left", padx=10)
 
@@ -160,6 +1146,9 @@ class BSplineNURBSWindow(tk.Toplevel):
         )
         self.slider.pack(side="left", padx=5)
 
+        ttk.Checkbutton(top, text="Adaptatif (px)", variable=self.use_adaptive, command=self.redraw).pack(side="left", padx=(10, 2))
+        ttk.Spinbox(top, from_=0.1, to=5.0, increment=0.1, width=4, textvariable=self.tolerance, command=self.redraw).pack(side="left", padx=5)
+
         # Ligne noeuds (simple, même vibe que le reste)
         knotbar = ttk.Frame(self)
         knotbar.pack(side="top", fill="x", pady=(0, 5))
@@ -180,6 +1169,7 @@ class BSplineNURBSWindow(tk.Toplevel):
     def bind_events(self):
         # même pattern que Bézier
         self.canvas.bind("<ButtonPress-1>", self.on_click_left)
+        self.canvas.bind("<Control-ButtonPress-1>", self.on_click_insert_knot)
         self.canvas.bind("<B1-Motion>", self.on_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
         self.canvas.bind("<Button-3>", self.start_new_curve)
@@ -203,6 +1193,7 @@ class BSplineNURBSWindow(tk.Toplevel):
             self.all_curves.pop(self.current_curve_idx)
             self.all_weights.pop(self.current_curve_idx)
             self.all_custom_knots.pop(self.current_curve_idx)
+            self._drop_curve_buffers(self.current_curve_idx)
 
             self.current_curve_idx = len(self.all_curves) - 1
             self.dragging_point = None
@@ -212,10 +1203,41 @@ class BSplineNURBSWindow(tk.Toplevel):
         self.all_curves = []
         self.all_weights = []
         self.all_custom_knots = []
+        for item in self.curve_items:
+            if item is not None:
+                self.canvas.delete(item)
+        self.curve_items = []
+        self.all_samples = []
         self.current_curve_idx = -1
         self.dragging_point = None
         self.redraw()
 
+    def interpolate_current_curve(self):
+        """
+        Les points cliqués de la courbe courante deviennent des points de passage :
+        on les remplace par les points de contrôle de la B-spline interpolante
+        (noeuds moyennés, enregistrés comme noeuds custom de la courbe).
+        """
+        c = self.current_curve_idx
+        if c == -1 or c >= len(self.all_curves):
+            return
+        p = int(self.degree.get())
+        if p < 1 or len(self.all_curves[c]) <= p:
+            return
+        ctrl, U = interpolate_curve(self.all_curves[c], p)
+        if len(ctrl) <= p:
+            # trop de doublons -> pas de courbe de degré p
+            return
+
+        self.all_curves[c] = ctrl
+        self.all_weights[c] = [1.0] * len(ctrl)
+        self.all_custom_knots[c] = U
+        self.use_custom_knots.set(True)
+        self.knots_text.set(", ".join(f"{u:.4g}" for u in U))
+        self.dragging_point = None
+        self._invalidate(c)
+        self.redraw()
+
     def duplicate_point(self):
         if self.dragging_point:
             c, p = self.dragging_point
@@ -224,6 +1246,7 @@ class BSplineNURBSWindow(tk.Toplevel):
                 w = self.all_weights[c][p]
                 self.all_curves[c].insert(p + 1, pt)
                 self.all_weights[c].insert(p + 1, w)
+                self._invalidate(c)
                 self.dragging_point = (c, p + 1)
                 self.redraw()
 
@@ -258,10 +1281,54 @@ class BSplineNURBSWindow(tk.Toplevel):
 
             self.all_curves[self.current_curve_idx].append((x, y))
             self.all_weights[self.current_curve_idx].append(1.0)  # poids par défaut
+            self._invalidate(self.current_curve_idx)
             self.dragging_point = (self.current_curve_idx, len(self.all_curves[self.current_curve_idx]) - 1)
 
         self.redraw()
 
+    def on_click_insert_knot(self, event):
+        """
+        Ctrl+Clic sur une courbe : projection sur la courbe puis insertion
+        d'un noeud (Boehm) au paramètre trouvé -> un point de contrôle de plus,
+        même forme. Noeuds et poids de la courbe mis à jour ensemble.
+        """
+        self.canvas.focus_set()
+        best = None
+        radius = 6.0
+        for c_idx in range(len(self.all_curves)):
+            hit = project_point(self.curve_segments(c_idx), event.x, event.y, radius)
+            if hit is not None:
+                best = (c_idx, hit[0])
+                radius = hit[2]
+        if best is None:
+            return
+
+        c, t = best
+        curve = self.all_curves[c]
+        p = max(1, int(self.degree.get()))
+        U = self._get_knots_for_curve(c, len(curve), p)
+        # clic au-delà d'un bout (t au bord du domaine) ou noeud déjà de
+        # multiplicité p : rien à insérer sans changer la forme
+        if t <= U[p] or t >= U[len(curve)] or bisect_right(U, t) - bisect_left(U, t) >= p:
+            return
+        if self.use_nurbs.get():
+            pts, weights, V = insert_knot_curve(curve, self.all_weights[c], p, U, t)
+        else:
+            # forme B-spline conservée ; les poids (inutilisés ici) suivent
+            # la même insertion pour rester alignés sur les points
+            pts, _, V = insert_knot_curve(curve, None, p, U, t)
+            weights = [P[0] for P in insert_knot([(w, 0.0, 1.0) for w in self.all_weights[c]], p, U, t)[0]]
+
+        self.all_curves[c] = pts
+        self.all_weights[c] = weights
+        self.all_custom_knots[c] = V
+        self.use_custom_knots.set(True)
+        self.knots_text.set(", ".join(f"{u:.4g}" for u in V))
+        self.current_curve_idx = c
+        self.dragging_point = None
+        self._invalidate(c)
+        self.redraw()
+
     def on_drag(self, event):
         if self.dragging_point:
             c, p = self.dragging_point
@@ -269,7 +1336,9 @@ class BSplineNURBSWindow(tk.Toplevel):
                 nx = event.x + self.dragging_offset[0]
                 ny = event.y + self.dragging_offset[1]
                 self.all_curves[c][p] = (nx, ny)
-                self.redraw()
+                # support local : seul le morceau de courbe touché est recalculé
+                if not self._update_local(c, p):
+                    self.redraw()
 
     def on_release(self, event):
         pass
@@ -280,12 +1349,14 @@ class BSplineNURBSWindow(tk.Toplevel):
             if c < len(self.all_curves) and p < len(self.all_curves[c]):
                 self.all_curves[c].pop(p)
                 self.all_weights[c].pop(p)
+                self._invalidate(c)
 
                 if not self.all_curves[c]:
                     # si courbe vide, on supprime (même logique que Bézier)
                     self.all_curves.pop(c)
                     self.all_weights.pop(c)
                     self.all_custom_knots.pop(c)
+                    self._drop_curve_buffers(c)
                     self.current_curve_idx = len(self.all_curves) - 1
 
                 self.dragging_point = None
@@ -361,13 +1432,25 @@ class BSplineNURBSWindow(tk.Toplevel):
         if w > 50:
             w = 50
         self.all_weights[c][p] = w
-        self.redraw()
+        if not self._update_local(c, p):
+            self.redraw()
 
-    # ---------------- Dessin ----------------
+    # ---------------- Échantillons par courbe ----------------
 
-    def redraw(self):
-        self.canvas.delete("all")
+    def _invalidate(self, c_idx):
+        if c_idx < len(self.all_samples):
+            self.all_samples[c_idx] = None
 
+    def _drop_curve_buffers(self, c_idx):
+        # garde curve_items / all_samples alignés sur all_curves
+        if c_idx < len(self.curve_items):
+            item = self.curve_items.pop(c_idx)
+            if item is not None:
+                self.canvas.delete(item)
+        if c_idx < len(self.all_samples):
+            self.all_samples.pop(c_idx)
+
+    def _step_value(self):
         # sécurité step
         try:
             step_val = self.step.get()
@@ -375,6 +1458,124 @@ class BSplineNURBSWindow(tk.Toplevel):
                 step_val = 0.01
         except:
             step_val = 0.01
+        return step_val
+
+    def _curve_setup(self, c_idx, step_val):
+        """(p, U, nb_seg) pour dessiner la courbe, None si pas dessinable."""
+        curve = self.all_curves[c_idx]
+        p = int(self.degree.get())
+        nb_ctrl = len(curve)
+        if p < 1:
+            p = 1
+        if nb_ctrl < 2 or nb_ctrl <= p:
+            # degré trop haut pour nb points -> on n’essaie pas
+            return None
+        U = self._get_knots_for_curve(c_idx, nb_ctrl, p)
+
+        # nombre de segments similaire à Bézier
+        nb_seg = int(1.0 / step_val)
+        if nb_seg < 10:
+            nb_seg = 10
+        return p, U, nb_seg
+
+    def curve_segments(self, c_idx):
+        """
+        Segments de Bézier de la courbe (decompose_bezier) avec les noeuds,
+        le degré et le mode courants. Le cache est indexé par le contenu :
+        points, poids ou all_custom_knots modifiés -> nouvelle décomposition.
+        """
+        curve = self.all_curves[c_idx]
+        p = max(1, int(self.degree.get()))
+        if len(curve) <= p:
+            return []
+        U = self._get_knots_for_curve(c_idx, len(curve), p)
+        weights = self.all_weights[c_idx] if self.use_nurbs.get() else None
+        return decompose_bezier(curve, weights, p, U)
+
+    def _update_local(self, c_idx, i):
+        """
+        Après modif du point (ou du poids) i : recalcule seulement les
+        échantillons de [U[i], U[i+p+1]) et patche ce morceau de la ligne Tk.
+        False si impossible (il faut alors un redraw complet).
+        """
+        if c_idx >= len(self.all_samples) or c_idx >= len(self.curve_items):
+            return False
+        buf = self.all_samples[c_idx]
+        item = self.curve_items[c_idx]
+        setup = self._curve_setup(c_idx, self._step_value())
+        if buf is None or item is None or setup is None or not buf["local"]:
+            # la courbe a changé : le redraw qui suit doit la recalculer
+            self._invalidate(c_idx)
+            return False
+        p, U, nb_seg = setup
+        nurbs = self.use_nurbs.get()
+        if buf["key"] != (tuple(U), p, nb_seg, nurbs):
+            # mode adaptatif ou réglages changés -> échantillons à refaire
+            self._invalidate(c_idx)
+            return False
+
+        weights = self.all_weights[c_idx] if nurbs else None
+        s0, s1 = update_samples(buf["pts"], self.all_curves[c_idx], weights, p, U, nb_seg, i)
+        self._patch_line(item, buf["pts"], s0, s1)
+        self._move_control_point(c_idx, i)
+        return True
+
+    def _patch_line(self, item, pts, s0, s1):
+        if s1 <= s0:
+            return
+        if s0 == 0 and s1 == len(pts):
+            draw_polyline_on_canvas(self.canvas, pts, item)
+            return
+        # indices Tk = indices de coordonnées (x0, y0, x1, y1, ...)
+        self.canvas.dchars(item, 2 * s0, 2 * s1 - 1)
+        self.canvas.insert(item, 2 * s0, [c for pt in pts[s0:s1] for c in pt])
+
+    def _move_control_point(self, c_idx, i):
+        deco = self.deco_items.get(c_idx)
+        curve = self.all_curves[c_idx]
+        if deco is None or len(deco["ovals"]) != len(curve):
+            self.redraw()
+            return
+        x, y = curve[i]
+        r = 6 if self.dragging_point == (c_idx, i) else 4
+        self.canvas.coords(deco["ovals"][i], x - r, y - r, x + r, y + r)
+        if i > 0:
+            self.canvas.coords(deco["poly"][i - 1], *curve[i - 1], x, y)
+        if i < len(curve) - 1:
+            self.canvas.coords(deco["poly"][i], x, y, *curve[i + 1])
+        if i in deco["texts"]:
+            self.canvas.coords(deco["texts"][i], x + 12, y - 10)
+            self.canvas.itemconfigure(deco["texts"][i], text=f"w={self.all_weights[c_idx][i]:.1f}")
+
+    # ---------------- Dessin ----------------
+
+    def redraw(self):
+        # les courbes gardent leur ligne Tk (mise à jour avec coords) et leurs
+        # échantillons ; le reste (polygones, points, poids) est redessiné
+        self.canvas.delete("deco")
+        self.deco_items = {}
+
+        step_val = self._step_value()
+        nurbs = self.use_nurbs.get()
+        tol = None
+        if self.use_adaptive.get():
+            try:
+                tol = self.tolerance.get()
+            except:
+                tol = 0.5
+            if tol <= 0:
+                tol = 0.5
+
+        # une ligne Tk + un buffer d'échantillons par courbe
+        while len(self.curve_items) > len(self.all_curves):
+            item = self.curve_items.pop()
+            if item is not None:
+                self.canvas.delete(item)
+        while len(self.curve_items) < len(self.all_curves):
+            self.curve_items.append(None)
+        del self.all_samples[len(self.all_curves):]
+        while len(self.all_samples) < len(self.all_curves):
+            self.all_samples.append(None)
 
         for c_idx, curve in enumerate(self.all_curves):
             is_sel = (c_idx == self.current_curve_idx)
@@ -382,59 +1583,69 @@ class BSplineNURBSWindow(tk.Toplevel):
 
             # points seuls
             if len(curve) < 2:
+                self.curve_items[c_idx] = draw_polyline_on_canvas(self.canvas, [], self.curve_items[c_idx])
+                self.all_samples[c_idx] = None
                 for p_idx, pt in enumerate(curve):
                     r = 6 if self.dragging_point == (c_idx, p_idx) else 4
                     outline = "red" if self.dragging_point == (c_idx, p_idx) else "black"
-                    self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline)
+                    self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline, tags=("deco", "top"))
                 continue
 
             # polygone de contrôle (même look que Bézier)
+            deco = {"poly": [], "ovals": [], "texts": {}}
             for i in range(len(curve) - 1):
                 p1, p2 = curve[i], curve[i + 1]
-                self.canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="lightgray", dash=(2, 2))
+                deco["poly"].append(self.canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="lightgray", dash=(2, 2), tags="deco"))
 
             # ---- calcul courbe B-Spline / NURBS ----
-            p = int(self.degree.get())
-            nb_ctrl = len(curve)
-            if p < 1:
-                p = 1
-            if nb_ctrl <= p:
-                # degré trop haut pour nb points -> on n’essaie pas
-                pass
+            setup = self._curve_setup(c_idx, step_val)
+            if setup is None:
+                self.all_samples[c_idx] = None
+                self.curve_items[c_idx] = draw_polyline_on_canvas(self.canvas, [], self.curve_items[c_idx])
             else:
-                U = self._get_knots_for_curve(c_idx, nb_ctrl, p)
-
-                t0 = U[p]
-                t1 = U[nb_ctrl]  # borne sup
-
-                # nombre de segments similaire à Bézier
-                nb_seg = int(1.0 / step_val)
-                if nb_seg < 10:
-                    nb_seg = 10
-
-                prev = None
-                for s in range(nb_seg + 1):
-                    t = t0 + (t1 - t0) * (s / nb_seg)
-
-                    if self.use_nurbs.get():
-                        pt = nurbs_point(curve, self.all_weights[c_idx], p, t, U)
-                        if pt is None:
-                            continue
-                    else:
-                        pt = bspline_point(curve, p, t, U)
-
-                    if prev is not None:
-                        self.canvas.create_line(prev[0], prev[1], pt[0], pt[1], fill=col, width=2)
-                    prev = pt
+                p, U, nb_seg = setup
+                key = (tuple(U), p, nb_seg if tol is None else ("adaptatif", tol), nurbs)
+                buf = self.all_samples[c_idx]
+                if buf is None or buf["key"] != key:
+                    weights = self.all_weights[c_idx] if nurbs else None
+                    mkey = CurveCache.key(curve, weights, U, p, key[2], nurbs)
+                    pts = self.curve_cache.get(mkey)
+                    if pts is None:
+                        if tol is not None:
+                            # segments de Bézier par span, subdivisés à la tolérance
+                            pts = adaptive_polyline(self.curve_segments(c_idx), tolerance=tol)
+                        elif nurbs:
+                            # base en cache par (U, p, nb_seg) -> juste un produit par courbe
+                            pts = nurbs_polyline(curve, weights, p, U, nb_seg)
+                        else:
+                            pts = bspline_polyline(curve, p, U, nb_seg)
+                        self.curve_cache.put(mkey, pts)
+                    # copie : le buffer est patché en place pendant un drag
+                    pts = list(pts)
+                    # patch local possible seulement sur la grille fixe, sans échantillon sauté
+                    buf = {"key": key, "pts": pts, "local": tol is None and len(pts) == nb_seg + 1, "drawn": None}
+                    self.all_samples[c_idx] = buf
+
+                # toute la courbe en une seule ligne, réémise seulement si elle a changé
+                if buf["drawn"] != (key, col) or self.curve_items[c_idx] is None:
+                    self.curve_items[c_idx] = draw_polyline_on_canvas(
+                        self.canvas, buf["pts"], self.curve_items[c_idx], fill=col, width=2, tags="curve"
+                    )
+                    buf["drawn"] = (key, col)
 
             # points de contrôle (même style que Bézier) + affichage poids si NURBS
             for p_idx, pt in enumerate(curve):
                 is_pt_sel = (self.dragging_point == (c_idx, p_idx))
                 r = 6 if is_pt_sel else 4
                 outline = "red" if is_pt_sel else "black"
-                self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline)
+                deco["ovals"].append(self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline, tags=("deco", "top")))
 
-                if self.use_nurbs.get() and is_sel:
+                if nurbs and is_sel:
                     w = self.all_weights[c_idx][p_idx] if p_idx < len(self.all_weights[c_idx]) else 1.0
                     # petit label discret
-                    self.canvas.create_text(pt[0] + 12, pt[1] - 10, text=f"w={w:.1f}", fill="black")
\ No newline at end of file
+                    deco["texts"][p_idx] = self.canvas.create_text(pt[0] + 12, pt[1] - 10, text=f"w={w:.1f}", fill="black", tags=("deco", "top"))
+            self.deco_items[c_idx] = deco
+
+        # ordre d'affichage : polygones < courbes < points
+        self.canvas.tag_raise("curve")
+        self.canvas.tag_raise("top")
@@ -1,12 +1,41 @@
 from __future__ import annotations
+import math
+import time
+import bisect
+import heapq
+from collections import OrderedDict
 from typing import List, Tuple, Optional
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: pure-Python paths are used instead
+    np = None
+
 Point = Tuple[float, float]
 
+# Up to this degree, bezier_polyline steps the curve by forward differencing
+FD_MAX_DEGREE = 5
+# Forward differences are recomputed exactly every FD_REANCHOR samples
+FD_REANCHOR = 32
+
+# Bounded LRU of Bernstein basis matrices, keyed by (degree, nb_seg)
+BASIS_CACHE_SIZE = 32
+_basis_cache: "OrderedDict[Tuple[int, int], object]" = OrderedDict()
+
+# Bounded LRU of arc-length tables, keyed by the control points
+ARC_CACHE_SIZE = 64
+_arc_cache: "OrderedDict[Tuple[Point, ...], ArcLengthTable]" = OrderedDict()
+
+# 5-point Gauss-Legendre rule on [-1, 1]
+_GL_NODES = (-0.9061798459386640, -0.5384693101056831, 0.0, 0.5384693101056831, 0.9061798459386640)
+_GL_WEIGHTS = (0.2369268850561891, 0.4786286704993665, 0.5688888888888889, 0.4786286704993665, 0.2369268850561891)
+
 
 def lerp(a: Point, b: Point, t: float) -> Point:
-    """Linear interpolation between points a and b."""
-    return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+    """Linear interpolation between points a and b (2D, or any dimension, e.g. homogeneous)."""
+    if len(a) == 2:
+        return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+    return tuple(x + (y - x) * t for x, y in zip(a, b))
 
 
 def bezier_point(points: List[Point], t: float) -> Point:
@@ -33,21 +62,205 @@ def bezier_point(points: List[Point], t: float) -> Point:
     return work[0]
 
 
+def _segment_count(step: float) -> int:
+    """Number of segments used to sample [0, 1] with the given step."""
+    # Ensure we include t=1.0
+    n = int(round(1.0 / step))
+    if n < 1:
+        n = 1
+    return n
+
+
+def bernstein_matrix(degree: int, nb_seg: int):
+    """
+    Return the (nb_seg+1) x (degree+1) Bernstein basis sampled at t = i / nb_seg.
+    Built once per (degree, nb_seg) and kept in a bounded LRU cache.
+    Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("bernstein_matrix: NumPy is required")
+
+    key = (degree, nb_seg)
+    basis = _basis_cache.get(key)
+    if basis is not None:
+        _basis_cache.move_to_end(key)
+        return basis
+
+    t = np.linspace(0.0, 1.0, nb_seg + 1)
+    u = 1.0 - t
+    # Degree elevation of the basis: B_k = (1-t) [B_{k-1}, 0] + t [0, B_{k-1}]
+    # (stable for high degrees, unlike comb(n, i) * t**i * (1-t)**(n-i))
+    basis = np.ones((nb_seg + 1, 1))
+    for _ in range(degree):
+        nxt = np.zeros((nb_seg + 1, basis.shape[1] + 1))
+        nxt[:, :-1] += basis * u[:, None]
+        nxt[:, 1:] += basis * t[:, None]
+        basis = nxt
+    basis.setflags(write=False)
+
+    _basis_cache[key] = basis
+    if len(_basis_cache) > BASIS_CACHE_SIZE:
+        _basis_cache.popitem(last=False)
+    return basis
+
+
+def bezier_polyline_matrix(points: List[Point], step: float = 0.01) -> List[Point]:
+    """
+    Sample the Bézier curve with one matrix product: basis @ control points.
+    Same output as the De Casteljau sampling (up to rounding). Requires NumPy.
+    """
+    if step <= 0:
+        raise ValueError("bezier_polyline_matrix: step must be > 0")
+    if len(points) < 2:
+        return points[:]
+
+    basis = bernstein_matrix(len(points) - 1, _segment_count(step))
+    coords = (basis @ np.asarray(points, dtype=float)).ravel().tolist()
+    return list(zip(coords[0::2], coords[1::2]))
+
+
+def bezier_polyline_batch(ctrl, step: float = 0.01):
+    """
+    Sample many Bézier curves of the same degree at once.
+    ctrl: array-like of shape (curves, degree+1, 2).
+    Returns an array of shape (curves, samples, 2). Requires NumPy.
+    """
+    if np is None:
+        raise ImportError("bezier_polyline_batch: NumPy is required")
+    if step <= 0:
+        raise ValueError("bezier_polyline_batch: step must be > 0")
+
+    ctrl = np.asarray(ctrl, dtype=float)
+    if ctrl.ndim != 3 or ctrl.shape[2] != 2 or ctrl.shape[1] < 1:
+        raise ValueError("bezier_polyline_batch: ctrl must have shape (curves, ctrl, 2)")
+
+    basis = bernstein_matrix(ctrl.shape[1] - 1, _segment_count(step))
+    # (samples, ctrl) @ (curves, ctrl, 2) -> (curves, samples, 2)
+    return np.matmul(basis, ctrl)
+
+
+def bezier_polylines(curves: List[List[Point]], step: float = 0.01) -> List[List[Point]]:
+    """
+    Sample a list of Bézier curves of any degrees.
+    Curves are grouped by number of control points and each group is evaluated
+    with one bezier_polyline_batch call. Output is in input order; curves with
+    fewer than 2 points are returned as copies.
+    Falls back to bezier_polyline per curve without NumPy.
+    """
+    if step <= 0:
+        raise ValueError("bezier_polylines: step must be > 0")
+    if np is None:
+        return [bezier_polyline(c, step) for c in curves]
+
+    result: List[List[Point]] = [c[:] for c in curves]
+    groups = {}
+    for idx, c in enumerate(curves):
+        if len(c) >= 2:
+            groups.setdefault(len(c), []).append(idx)
+
+    for indices in groups.values():
+        packed = bezier_polyline_batch([curves[i] for i in indices], step)
+        flat = packed.reshape(len(indices), -1).tolist()
+        for i, coords in zip(indices, flat):
+            result[i] = list(zip(coords[0::2], coords[1::2]))
+    return result
+
+
+def _power_coeffs(values: List[float]) -> List[float]:
+    """
+    Bernstein -> power basis for one coordinate:
+    a_k = C(n, k) * sum_i (-1)^(k-i) C(k, i) v_i
+    """
+    n = len(values) - 1
+    coeffs = []
+    for k in range(n + 1):
+        acc = 0.0
+        for i in range(k + 1):
+            term = math.comb(k, i) * values[i]
+            acc += term if (k - i) % 2 == 0 else -term
+        coeffs.append(math.comb(n, k) * acc)
+    return coeffs
+
+
+def _horner(coeffs: List[float], t: float) -> float:
+    acc = 0.0
+    for a in reversed(coeffs):
+        acc = acc * t + a
+    return acc
+
+
+def _forward_differences(coeffs: List[float], start: int, nb_seg: int) -> List[float]:
+    """[f, Δf, Δ²f, ...] at sample `start`, evaluated exactly (Horner)."""
+    degree = len(coeffs) - 1
+    table = [_horner(coeffs, (start + j) / nb_seg) for j in range(degree + 1)]
+    diffs = [table[0]]
+    for _ in range(degree):
+        table = [table[j + 1] - table[j] for j in range(len(table) - 1)]
+        diffs.append(table[0])
+    return diffs
+
+
+def bezier_polyline_fd(
+    points: List[Point],
+    step: float = 0.01,
+    reanchor: int = FD_REANCHOR,
+) -> List[Point]:
+    """
+    Sample a low-degree Bézier curve by forward differencing:
+    after a one-time setup, each sample costs `degree` additions per coordinate.
+    The difference tables are recomputed exactly every `reanchor` samples
+    so that rounding errors cannot drift along the curve.
+    """
+    if step <= 0:
+        raise ValueError("bezier_polyline_fd: step must be > 0")
+    if reanchor < 1:
+        raise ValueError("bezier_polyline_fd: reanchor must be >= 1")
+    if len(points) < 2:
+        return points[:]
+
+    nb_seg = _segment_count(step)
+    degree = len(points) - 1
+    cx = _power_coeffs([p[0] for p in points])
+    cy = _power_coeffs([p[1] for p in points])
+
+    sampled: List[Point] = []
+    i = 0
+    while i <= nb_seg:
+        dx = _forward_differences(cx, i, nb_seg)
+        dy = _forward_differences(cy, i, nb_seg)
+        block = min(reanchor, nb_seg + 1 - i)
+        for _ in range(block):
+            sampled.append((dx[0], dy[0]))
+            # ascending order: each term uses the not-yet-updated next one
+            for k in range(degree):
+                dx[k] += dx[k + 1]
+                dy[k] += dy[k + 1]
+        i += block
+
+    # exact endpoints (the curve interpolates P0 and Pn)
+    sampled[0] = points[0]
+    sampled[-1] = points[-1]
+    return sampled
+
+
 def bezier_polyline(points: List[Point], step: float = 0.01) -> List[Point]:
     """
     Sample the Bézier curve into a polyline.
     step: ratio increment (e.g., 0.01 -> ~101 points).
+    Uses the cached Bernstein matrix when NumPy is available, otherwise
+    forward differencing up to FD_MAX_DEGREE (see benchmark()).
     """
     if step <= 0:
         raise ValueError("bezier_polyline: step must be > 0")
     if len(points) < 2:
         return points[:]
 
-    # Ensure we include t=1.0
-    n = int(round(1.0 / step))
-    if n < 1:
-        n = 1
+    if np is not None:
+        return bezier_polyline_matrix(points, step)
+    if len(points) - 1 <= FD_MAX_DEGREE:
+        return bezier_polyline_fd(points, step)
 
+    n = _segment_count(step)
     sampled: List[Point] = []
     for i in range(n + 1):
         t = i / n
@@ -55,6 +268,650 @@ def bezier_polyline(points: List[Point], step: float = 0.01) -> List[Point]:
     return sampled
 
 
+def split_bezier(points: List[Point], t: float = 0.5) -> Tuple[List[Point], List[Point]]:
+    """
+    Split the Bézier curve at t with De Casteljau.
+    Returns the control points of the [0, t] and [t, 1] pieces.
+    """
+    left = [points[0]]
+    right = [points[-1]]
+    work = points[:]
+    while len(work) > 1:
+        work = [lerp(work[i], work[i + 1], t) for i in range(len(work) - 1)]
+        left.append(work[0])
+        right.append(work[-1])
+    right.reverse()
+    return left, right
+
+
+def _flatness_sq(points: List[Point]) -> float:
+    """
+    Squared max distance of the inner control points to the chord segment P0-Pn.
+    The curve lies in their convex hull, so it stays within that distance of
+    the segment (a line distance would accept control points doubling back).
+    """
+    x0, y0 = points[0]
+    x1, y1 = points[-1]
+    dx = x1 - x0
+    dy = y1 - y0
+    chord_sq = dx * dx + dy * dy
+    worst = 0.0
+    for x, y in points[1:-1]:
+        ex = x - x0
+        ey = y - y0
+        if chord_sq != 0.0:
+            u = (ex * dx + ey * dy) / chord_sq
+            if u > 1.0:
+                ex = x - x1
+                ey = y - y1
+            elif u > 0.0:
+                ex -= u * dx
+                ey -= u * dy
+        d = ex * ex + ey * ey
+        if d > worst:
+            worst = d
+    return worst
+
+
+def bezier_polyline_adaptive(
+    points: List[Point],
+    tolerance: float = 0.5,
+    max_depth: int = 16,
+    project=None,
+) -> List[Point]:
+    """
+    Sample the Bézier curve by recursive subdivision instead of a fixed step.
+    Each piece is split at t=0.5 until its control polygon lies within
+    `tolerance` (same unit as the points, e.g. pixels) of its chord.
+    Returns the same polyline shape as bezier_polyline.
+    `project` maps control points to 2D before the flatness test and output,
+    e.g. homogeneous (wx, wy, w) -> (x, y) for a rational curve with w > 0.
+    """
+    if tolerance <= 0:
+        raise ValueError("bezier_polyline_adaptive: tolerance must be > 0")
+    if len(points) < 2:
+        return [project(P) for P in points] if project else points[:]
+
+    tol_sq = tolerance * tolerance
+    sampled: List[Point] = [project(points[0]) if project else points[0]]
+    # Explicit stack (right piece pushed first so output stays ordered)
+    stack = [(points, 0)]
+    while stack:
+        piece, depth = stack.pop()
+        flat = piece if project is None else [project(P) for P in piece]
+        if depth >= max_depth or _flatness_sq(flat) <= tol_sq:
+            sampled.append(flat[-1])
+            continue
+        left, right = split_bezier(piece)
+        stack.append((right, depth + 1))
+        stack.append((left, depth + 1))
+    return sampled
+
+
+def bezier_derivative(points: List[Point]) -> List[Point]:
+    """Control points of the hodograph B'(t): n * (P[i+1] - P[i])."""
+    n = len(points) - 1
+    return [(n * (points[i + 1][0] - points[i][0]), n * (points[i + 1][1] - points[i][1]))
+            for i in range(n)]
+
+
+def _bbox(points: List[Point]) -> Tuple[float, float, float, float]:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _bbox_dist_sq(box: Tuple[float, float, float, float], x: float, y: float) -> float:
+    dx = max(box[0] - x, 0.0, x - box[2])
+    dy = max(box[1] - y, 0.0, y - box[3])
+    return dx * dx + dy * dy
+
+
+class BezierHitTree:
+    """
+    Recursive subdivision tree of one Bézier curve, with the bounding box of
+    each node's control polygon (the curve piece lies inside it).
+    Answers closest-point queries by best-first descent, then Newton refinement.
+    Build once per curve; rebuild when its control points change.
+    """
+
+    def __init__(self, points: List[Point], tolerance: float = 0.5, max_depth: int = 12):
+        if len(points) < 2:
+            raise ValueError("BezierHitTree: need at least 2 control points")
+        self.points = points[:]
+        self.d1 = bezier_derivative(self.points)
+        self.d2 = bezier_derivative(self.d1) if len(self.d1) > 1 else [(0.0, 0.0)]
+        self.tolerance = tolerance
+        self.max_depth = max_depth
+        # node = (bbox, t0, t1, ctrl, children) ; children is None for leaves
+        self.root = self._build(self.points, 0.0, 1.0, 0)
+
+    def _build(self, ctrl, t0, t1, depth):
+        box = _bbox(ctrl)
+        if depth >= self.max_depth or _flatness_sq(ctrl) <= self.tolerance ** 2:
+            return (box, t0, t1, ctrl, None)
+        left, right = split_bezier(ctrl)
+        tm = 0.5 * (t0 + t1)
+        children = (self._build(left, t0, tm, depth + 1), self._build(right, tm, t1, depth + 1))
+        return (box, t0, t1, ctrl, children)
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        return self.root[0]
+
+    def _refine(self, x: float, y: float, t: float, iterations: int = 5,
+                lo: float = 0.0, hi: float = 1.0) -> float:
+        """Newton on f(t) = (B(t) - q) . B'(t), kept in [lo, hi]."""
+        for _ in range(iterations):
+            px, py = bezier_point(self.points, t)
+            d1x, d1y = bezier_point(self.d1, t)
+            d2x, d2y = bezier_point(self.d2, t)
+            ex, ey = px - x, py - y
+            f = ex * d1x + ey * d1y
+            df = d1x * d1x + d1y * d1y + ex * d2x + ey * d2y
+            if df <= 0.0:
+                break
+            nt = min(hi, max(lo, t - f / df))
+            if abs(nt - t) < 1e-9:
+                t = nt
+                break
+            t = nt
+        return t
+
+    def closest(self, x: float, y: float, radius: float = math.inf) -> Optional[Tuple[float, Point, float]]:
+        """
+        Closest point of the curve to (x, y) within `radius`.
+        Each leaf visited is seeded on its chord and refined within its own
+        [t0, t1], so Newton cannot jump to another basin; the seed is kept if
+        Newton ends farther. Distances are measured on the curve and node boxes
+        contain their piece, so pruning needs no slack on the radius; the
+        distance found is within `tolerance` of the true one.
+        Returns (t, point, distance) or None.
+        """
+        best_sq = radius * radius if radius != math.inf else math.inf
+        best = None
+        heap = [(_bbox_dist_sq(self.root[0], x, y), 0, self.root)]
+        counter = 1
+        while heap:
+            d_sq, _, node = heapq.heappop(heap)
+            if d_sq > best_sq:
+                break
+            box, t0, t1, ctrl, children = node
+            if children is None:
+                # project on the chord of the (flat) piece
+                (ax, ay), (bx, by) = ctrl[0], ctrl[-1]
+                vx, vy = bx - ax, by - ay
+                L = vx * vx + vy * vy
+                u = 0.0 if L == 0 else min(1.0, max(0.0, ((x - ax) * vx + (y - ay) * vy) / L))
+                seed = t0 + u * (t1 - t0)
+                for t in (seed, self._refine(x, y, seed, lo=t0, hi=t1)):
+                    pt = bezier_point(self.points, t)
+                    e = (pt[0] - x) ** 2 + (pt[1] - y) ** 2
+                    if e <= best_sq:
+                        best_sq = e
+                        best = (t, pt, math.sqrt(e))
+                continue
+            for child in children:
+                heapq.heappush(heap, (_bbox_dist_sq(child[0], x, y), counter, child))
+                counter += 1
+        return best
+
+
+def pick_curve(
+    trees: List[Optional[BezierHitTree]],
+    x: float,
+    y: float,
+    radius: float = 6.0,
+) -> Optional[Tuple[int, float, Point]]:
+    """
+    Closest curve to (x, y) within `radius` among `trees` (None entries are skipped).
+    Returns (index, t, point) or None.
+    """
+    best = None
+    for idx, tree in enumerate(trees):
+        if tree is None or _bbox_dist_sq(tree.bbox, x, y) > radius * radius:
+            continue
+        hit = tree.closest(x, y, radius)
+        if hit is not None:
+            t, pt, dist = hit
+            best = (idx, t, pt)
+            radius = dist
+    return best
+
+
+class ArcLengthTable:
+    """
+    Cumulative arc length of a Bézier curve over `spans` equal t-intervals,
+    each integrated with 5-point Gauss-Legendre on |B'(t)|.
+    Inverts length -> t by binary search on the table, then Newton.
+    """
+
+    def __init__(self, points: List[Point], spans: Optional[int] = None):
+        if len(points) < 2:
+            raise ValueError("ArcLengthTable: need at least 2 control points")
+        self.points = points[:]
+        self.d1 = bezier_derivative(self.points)
+        if spans is None:
+            spans = max(8, 4 * (len(points) - 1))
+        self.spans = spans
+        self.cumulative = [0.0]
+        for k in range(spans):
+            self.cumulative.append(self.cumulative[-1] + self._integrate(k / spans, (k + 1) / spans))
+
+    @property
+    def length(self) -> float:
+        return self.cumulative[-1]
+
+    def speed(self, t: float) -> float:
+        dx, dy = bezier_point(self.d1, t)
+        return math.hypot(dx, dy)
+
+    def _integrate(self, ta: float, tb: float) -> float:
+        half = 0.5 * (tb - ta)
+        mid = 0.5 * (ta + tb)
+        return half * sum(w * self.speed(mid + half * x) for x, w in zip(_GL_NODES, _GL_WEIGHTS))
+
+    def t_at_length(self, s: float, iterations: int = 8) -> float:
+        """Parameter t such that the arc length from 0 to t is s (clamped)."""
+        if s <= 0.0:
+            return 0.0
+        if s >= self.length:
+            return 1.0
+
+        k = min(bisect.bisect_right(self.cumulative, s) - 1, self.spans - 1)
+        ta, tb = k / self.spans, (k + 1) / self.spans
+        base = self.cumulative[k]
+        span_len = self.cumulative[k + 1] - base
+        t = ta + (s - base) / span_len * (tb - ta) if span_len > 0 else ta
+
+        lo, hi = ta, tb
+        for _ in range(iterations):
+            f = base + self._integrate(ta, t) - s
+            if abs(f) < 1e-9:
+                break
+            if f > 0:
+                hi = t
+            else:
+                lo = t
+            v = self.speed(t)
+            nt = t - f / v if v > 0 else lo
+            # fall back to bisection when Newton leaves the bracket
+            if not (lo < nt < hi):
+                nt = 0.5 * (lo + hi)
+            t = nt
+        return t
+
+    def point_at_length(self, s: float) -> Point:
+        return bezier_point(self.points, self.t_at_length(s))
+
+    def equidistant_samples(self, n: int) -> List[Point]:
+        """n points evenly spaced along the curve, both endpoints included."""
+        if n < 2:
+            raise ValueError("equidistant_samples: n must be >= 2")
+        L = self.length
+        return [self.point_at_length(L * i / (n - 1)) for i in range(n)]
+
+
+def arc_length_table(points: List[Point]) -> ArcLengthTable:
+    """ArcLengthTable for `points`, rebuilt only when the control points change."""
+    key = tuple(points)
+    table = _arc_cache.get(key)
+    if table is not None:
+        _arc_cache.move_to_end(key)
+        return table
+    table = ArcLengthTable(points)
+    _arc_cache[key] = table
+    if len(_arc_cache) > ARC_CACHE_SIZE:
+        _arc_cache.popitem(last=False)
+    return table
+
+
+def point_at_length(points: List[Point], s: float) -> Point:
+    """Point at arc length s from the start of the curve."""
+    return arc_length_table(points).point_at_length(s)
+
+
+def equidistant_samples(points: List[Point], n: int) -> List[Point]:
+    """n points at equal arc-length spacing along the curve."""
+    return arc_length_table(points).equidistant_samples(n)
+
+
+def _boxes_overlap(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float], eps: float = 0.0) -> bool:
+    return a[0] <= b[2] + eps and b[0] <= a[2] + eps and a[1] <= b[3] + eps and b[1] <= a[3] + eps
+
+
+def _newton_intersection(a, da, b, db, t1, t2, iterations: int = 6) -> Tuple[float, float]:
+    """Newton on A(t1) - B(t2) = 0, Jacobian [A'(t1), -B'(t2)]."""
+    for _ in range(iterations):
+        ax, ay = bezier_point(a, t1)
+        bx, by = bezier_point(b, t2)
+        fx, fy = ax - bx, ay - by
+        if fx * fx + fy * fy < 1e-20:
+            break
+        j11, j21 = bezier_point(da, t1)
+        j12, j22 = bezier_point(db, t2)
+        j12, j22 = -j12, -j22
+        det = j11 * j22 - j12 * j21
+        if det == 0.0:
+            break
+        t1 = min(1.0, max(0.0, t1 - (fx * j22 - fy * j12) / det))
+        t2 = min(1.0, max(0.0, t2 - (fy * j11 - fx * j21) / det))
+    return t1, t2
+
+
+def _tree_intersections(ta: BezierHitTree, tb: BezierHitTree, tolerance: float) -> List[Tuple[float, float, Point]]:
+    """Intersections of two curves by simultaneous descent of their subdivision trees."""
+    a, da = ta.points, ta.d1
+    b, db = tb.points, tb.d1
+    tol_sq = tolerance * tolerance
+    found: List[Tuple[float, float, Point]] = []
+
+    stack = [(ta.root, tb.root)]
+    while stack:
+        na, nb = stack.pop()
+        box_a, box_b = na[0], nb[0]
+        if not _boxes_overlap(box_a, box_b, tolerance):
+            continue
+
+        leaf_a = na[4] is None
+        leaf_b = nb[4] is None
+        if leaf_a and leaf_b:
+            # segment / segment on the chords of the two flat pieces
+            (px, py), (qx, qy) = na[3][0], na[3][-1]
+            (rx, ry), (sx, sy) = nb[3][0], nb[3][-1]
+            ux, uy = qx - px, qy - py
+            vx, vy = sx - rx, sy - ry
+            den = ux * vy - uy * vx
+            if den == 0.0:
+                continue
+            u = ((rx - px) * vy - (ry - py) * vx) / den
+            v = ((rx - px) * uy - (ry - py) * ux) / den
+            # margin: an intersection on a split boundary must not fall between pieces
+            if not (-0.1 <= u <= 1.1 and -0.1 <= v <= 1.1):
+                continue
+            t1 = min(1.0, max(0.0, na[1] + u * (na[2] - na[1])))
+            t2 = min(1.0, max(0.0, nb[1] + v * (nb[2] - nb[1])))
+            t1, t2 = _newton_intersection(a, da, b, db, t1, t2)
+            pta = bezier_point(a, t1)
+            ptb = bezier_point(b, t2)
+            if (pta[0] - ptb[0]) ** 2 + (pta[1] - ptb[1]) ** 2 > tol_sq:
+                continue
+            if any(abs(t1 - f1) < 1e-6 and abs(t2 - f2) < 1e-6 for f1, f2, _ in found):
+                continue
+            found.append((t1, t2, pta))
+            continue
+
+        # descend into the larger node (or the only one that is not a leaf)
+        size_a = (box_a[2] - box_a[0]) + (box_a[3] - box_a[1])
+        size_b = (box_b[2] - box_b[0]) + (box_b[3] - box_b[1])
+        if leaf_b or (not leaf_a and size_a >= size_b):
+            for child in na[4]:
+                stack.append((child, nb))
+        else:
+            for child in nb[4]:
+                stack.append((na, child))
+
+    found.sort()
+    return found
+
+
+def bezier_intersections(
+    a: List[Point],
+    b: List[Point],
+    tolerance: float = 0.25,
+) -> List[Tuple[float, float, Point]]:
+    """
+    Intersections between Bézier curves a and b, as (t1, t2, point) triples.
+    Both curves are subdivided (BezierHitTree) and node pairs whose
+    control-polygon boxes do not overlap are pruned; flat leaf pairs are
+    intersected as segments and polished with Newton to `tolerance`.
+    Overlapping (coincident) stretches are not reported.
+    """
+    if len(a) < 2 or len(b) < 2:
+        return []
+    # leaves flat to ~1px are enough: Newton recovers the precision
+    flat = max(tolerance, 1.0)
+    return _tree_intersections(BezierHitTree(a, flat), BezierHitTree(b, flat), tolerance)
+
+
+def scene_intersections(
+    curves: List[List[Point]],
+    tolerance: float = 0.25,
+) -> List[Tuple[int, int, float, float, Point]]:
+    """
+    All pairwise intersections in a list of curves, as (i, j, t_i, t_j, point), i < j.
+    Candidate pairs come from a sweep over the control-polygon boxes sorted by xmin;
+    each curve's subdivision tree is built once and shared by all its pairs.
+    Self-intersections are not searched.
+    """
+    return IntersectionCache(tolerance).intersections([(i, 0, c) for i, c in enumerate(curves)])
+
+
+class IntersectionCache:
+    """
+    scene_intersections across edits: subdivision trees are kept per curve key
+    and version, and pair results per (key, key) with both versions, so after
+    an edit only the pairs involving a changed curve are recomputed.
+    Keys must be stable and comparable (e.g. int ids); curves without a key
+    entry in the next call are forgotten.
+    """
+
+    def __init__(self, tolerance: float = 0.25):
+        self.tolerance = tolerance
+        self.trees = {}   # key -> (version, BezierHitTree)
+        self.pairs = {}   # (ka, kb), ka < kb -> (version_a, version_b, [(t_a, t_b, point)])
+
+    def _tree(self, key, version, curve: List[Point]) -> BezierHitTree:
+        cached = self.trees.get(key)
+        if cached is None or cached[0] != version:
+            cached = (version, BezierHitTree(curve, max(self.tolerance, 1.0)))
+            self.trees[key] = cached
+        return cached[1]
+
+    def intersections(self, items) -> List[Tuple[int, int, float, float, Point]]:
+        """
+        `items` lists (key, version, curve) in scene order; a curve whose version
+        changed is rebuilt. Returns the same tuples as scene_intersections,
+        with i, j positions in `items`.
+        """
+        tolerance = self.tolerance
+        trees = {}
+        for i, (key, version, curve) in enumerate(items):
+            if len(curve) >= 2:
+                trees[i] = self._tree(key, version, curve)
+        keys = set(item[0] for item in items)
+        for key in [k for k in self.trees if k not in keys]:
+            del self.trees[key]
+        # only the pairs still overlapping are kept for next time
+        pairs = {}
+
+        order = sorted(trees, key=lambda i: trees[i].bbox[0])
+        result = []
+        active: List[int] = []
+        for i in order:
+            box = trees[i].bbox
+            active = [j for j in active if trees[j].bbox[2] + tolerance >= box[0]]
+            for j in active:
+                if not _boxes_overlap(box, trees[j].bbox, tolerance):
+                    continue
+                lo, hi = (i, j) if i < j else (j, i)
+                (ka, va, _), (kb, vb, _) = items[lo], items[hi]
+                swap = kb < ka
+                pair = (kb, ka) if swap else (ka, kb)
+                versions = (vb, va) if swap else (va, vb)
+                cached = self.pairs.get(pair)
+                if cached is None or cached[:2] != versions:
+                    ta, tb = (trees[hi], trees[lo]) if swap else (trees[lo], trees[hi])
+                    cached = versions + (_tree_intersections(ta, tb, tolerance),)
+                pairs[pair] = cached
+                for t1, t2, pt in cached[2]:
+                    if swap:
+                        # the stored point lies on curve hi: report it on lo
+                        t1, t2 = t2, t1
+                        pt = bezier_point(trees[lo].points, t1)
+                    result.append((lo, hi, t1, t2, pt))
+            active.append(i)
+
+        self.pairs = pairs
+        result.sort()
+        return result
+
+
+def _normalize(v: Point) -> Point:
+    n = math.hypot(v[0], v[1])
+    if n == 0.0:
+        return (0.0, 0.0)
+    return (v[0] / n, v[1] / n)
+
+
+def _chord_params(d: List[Point], first: int, last: int) -> List[float]:
+    u = [0.0]
+    for i in range(first + 1, last + 1):
+        u.append(u[-1] + math.hypot(d[i][0] - d[i - 1][0], d[i][1] - d[i - 1][1]))
+    total = u[-1]
+    if total == 0.0:
+        return [i / (len(u) - 1) for i in range(len(u))]
+    return [x / total for x in u]
+
+
+def _generate_cubic(d, first, last, u, t1: Point, t2: Point) -> List[Point]:
+    """Least-squares cubic with fixed end points and tangent directions t1, t2."""
+    p0, p3 = d[first], d[last]
+    c00 = c01 = c11 = x0 = x1 = 0.0
+    for i, t in enumerate(u):
+        s = 1.0 - t
+        b0, b1, b2, b3 = s * s * s, 3 * t * s * s, 3 * t * t * s, t * t * t
+        a1 = (t1[0] * b1, t1[1] * b1)
+        a2 = (t2[0] * b2, t2[1] * b2)
+        c00 += a1[0] * a1[0] + a1[1] * a1[1]
+        c01 += a1[0] * a2[0] + a1[1] * a2[1]
+        c11 += a2[0] * a2[0] + a2[1] * a2[1]
+        px, py = d[first + i]
+        tx = px - (p0[0] * (b0 + b1) + p3[0] * (b2 + b3))
+        ty = py - (p0[1] * (b0 + b1) + p3[1] * (b2 + b3))
+        x0 += a1[0] * tx + a1[1] * ty
+        x1 += a2[0] * tx + a2[1] * ty
+
+    det = c00 * c11 - c01 * c01
+    seg_len = math.hypot(p3[0] - p0[0], p3[1] - p0[1])
+    alpha_l = alpha_r = 0.0
+    if abs(det) > 1e-12:
+        alpha_l = (x0 * c11 - x1 * c01) / det
+        alpha_r = (c00 * x1 - c01 * x0) / det
+    eps = 1e-6 * seg_len
+    if alpha_l < eps or alpha_r < eps:
+        # Wu/Barsky heuristic when the system is degenerate
+        alpha_l = alpha_r = seg_len / 3.0
+    return [
+        p0,
+        (p0[0] + t1[0] * alpha_l, p0[1] + t1[1] * alpha_l),
+        (p3[0] + t2[0] * alpha_r, p3[1] + t2[1] * alpha_r),
+        p3,
+    ]
+
+
+def _max_fit_error(d, first, last, bez, u) -> Tuple[float, int]:
+    """Max squared distance between the points and the cubic, and where it occurs."""
+    worst = 0.0
+    split = (first + last) // 2
+    for i in range(first + 1, last):
+        px, py = bezier_point(bez, u[i - first])
+        e = (px - d[i][0]) ** 2 + (py - d[i][1]) ** 2
+        if e >= worst:
+            worst = e
+            split = i
+    return worst, split
+
+
+def _reparameterize(d, first, bez, u) -> List[float]:
+    """One Newton step per point on (Q(u) - P) . Q'(u)."""
+    d1 = bezier_derivative(bez)
+    d2 = bezier_derivative(d1)
+    out = []
+    for i, t in enumerate(u):
+        qx, qy = bezier_point(bez, t)
+        q1x, q1y = bezier_point(d1, t)
+        q2x, q2y = bezier_point(d2, t)
+        px, py = d[first + i]
+        num = (qx - px) * q1x + (qy - py) * q1y
+        den = q1x * q1x + q1y * q1y + (qx - px) * q2x + (qy - py) * q2y
+        out.append(t if den == 0.0 else min(1.0, max(0.0, t - num / den)))
+    return out
+
+
+def fit_stroke(points: List[Point], tolerance: float = 2.0, max_iterations: int = 4) -> List[List[Point]]:
+    """
+    Fit a dense stroke with a chain of cubic Bézier segments (Schneider's algorithm).
+    Each segment stays within `tolerance` of the stroke points; consecutive
+    segments share their end point and tangent direction.
+    Returns the control points of each cubic, in stroke order.
+    """
+    d: List[Point] = []
+    for p in points:
+        if not d or p != d[-1]:
+            d.append(p)
+    if len(d) < 2:
+        return []
+
+    tol_sq = tolerance * tolerance
+    segments: List[List[Point]] = []
+
+    def fit(first, last, t1, t2):
+        if last - first == 1:
+            dist = math.hypot(d[last][0] - d[first][0], d[last][1] - d[first][1]) / 3.0
+            segments.append([d[first],
+                             (d[first][0] + t1[0] * dist, d[first][1] + t1[1] * dist),
+                             (d[last][0] + t2[0] * dist, d[last][1] + t2[1] * dist),
+                             d[last]])
+            return
+
+        u = _chord_params(d, first, last)
+        bez = _generate_cubic(d, first, last, u, t1, t2)
+        err, split = _max_fit_error(d, first, last, bez, u)
+        if err < tol_sq:
+            segments.append(bez)
+            return
+
+        # close enough: try Newton reparameterization before splitting
+        if err < 4 * tol_sq:
+            for _ in range(max_iterations):
+                u = _reparameterize(d, first, bez, u)
+                bez = _generate_cubic(d, first, last, u, t1, t2)
+                err, split = _max_fit_error(d, first, last, bez, u)
+                if err < tol_sq:
+                    segments.append(bez)
+                    return
+
+        center = _normalize((d[split - 1][0] - d[split + 1][0], d[split - 1][1] - d[split + 1][1]))
+        fit(first, split, t1, center)
+        fit(split, last, (-center[0], -center[1]), t2)
+
+    left = _normalize((d[1][0] - d[0][0], d[1][1] - d[0][1]))
+    right = _normalize((d[-2][0] - d[-1][0], d[-2][1] - d[-1][1]))
+    fit(0, len(d) - 1, left, right)
+    return segments
+
+
+def draw_polyline_on_canvas(canvas, points: List[Point], item: Optional[int] = None, **options) -> Optional[int]:
+    """
+    Emit `points` as a single multi-point line item and return its id.
+    If `item` is given, that item is updated in place (coords + options)
+    instead of creating a new one. Fewer than 2 points -> no item (None).
+    """
+    if len(points) < 2:
+        if item is not None:
+            canvas.delete(item)
+        return None
+
+    flat = [c for p in points for c in p]
+    if item is None:
+        return canvas.create_line(*flat, **options)
+    canvas.coords(item, *flat)
+    if options:
+        canvas.itemconfigure(item, **options)
+    return item
+
+
 def draw_bezier_on_canvas(
     canvas,
     control_points: List[Point],
@@ -63,10 +920,12 @@ def draw_bezier_on_canvas(
     width: int = 2,
     dash: Optional[Tuple[int, int]] = None,
     tags: str = "bezier",
+    tolerance: Optional[float] = None,
 ) -> List[Point]:
     """
     Draw a Bézier curve on a Tkinter Canvas.
     Returns the sampled polyline points (world/screen coords = whatever you pass in).
+    If `tolerance` is given, the curve is flattened adaptively and `step` is ignored.
 
     You can pass points in your "world" coords IF you transform them before calling
     (e.g., using your world_to_screen).
@@ -74,12 +933,62 @@ def draw_bezier_on_canvas(
     if len(control_points) < 2:
         return control_points[:]
 
-    curve = bezier_polyline(control_points, step=step)
+    if tolerance is not None:
+        curve = bezier_polyline_adaptive(control_points, tolerance=tolerance)
+    else:
+        curve = bezier_polyline(control_points, step=step)
 
-    # Draw as connected line segments
-    for i in range(len(curve) - 1):
-        x1, y1 = curve[i]
-        x2, y2 = curve[i + 1]
-        canvas.create_line(x1, y1, x2, y2, fill=color, width=width, dash=dash, tags=tags)
+    # Draw as one multi-point line item
+    draw_polyline_on_canvas(canvas, curve, fill=color, width=width, dash=dash, tags=tags)
 
     return curve
+
+
+def _bernstein_polyline(points: List[Point], step: float) -> List[Point]:
+    """Reference path: per-sample Bernstein sum (comb and powers every time)."""
+    n = len(points) - 1
+    nb_seg = _segment_count(step)
+    sampled: List[Point] = []
+    for s in range(nb_seg + 1):
+        t = s / nb_seg
+        x = y = 0.0
+        for i, (px, py) in enumerate(points):
+            b = math.comb(n, i) * (t ** i) * ((1 - t) ** (n - i))
+            x += px * b
+            y += py * b
+        sampled.append((x, y))
+    return sampled
+
+
+def benchmark(degrees=(2, 3, 5, 10, 30), step: float = 0.005, repeat: int = 20) -> None:
+    """
+    Compare the polyline evaluators on random curves and print ms per curve.
+    Run with: python Bezier.py
+    """
+    import random
+
+    paths = [
+        ("casteljau", lambda pts: [bezier_point(pts, i / _segment_count(step))
+                                   for i in range(_segment_count(step) + 1)]),
+        ("bernstein", lambda pts: _bernstein_polyline(pts, step)),
+        ("forward-diff", lambda pts: bezier_polyline_fd(pts, step)),
+    ]
+    if np is not None:
+        paths.append(("matrix", lambda pts: bezier_polyline_matrix(pts, step)))
+
+    print(f"step={step} ({_segment_count(step) + 1} samples), ms per curve")
+    print("degree  " + "".join(f"{name:>14}" for name, _ in paths))
+    for degree in degrees:
+        pts = [(random.uniform(0, 1000), random.uniform(0, 700)) for _ in range(degree + 1)]
+        row = f"{degree:>6}  "
+        for _, fn in paths:
+            fn(pts)  # warm caches
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                fn(pts)
+            row += f"{(time.perf_counter() - t0) * 1000 / repeat:>14.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    benchmark()
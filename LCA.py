@@ -1,5 +1,15 @@
 import math
 
+def _is_winding(rule):
+    rule = (rule or "evenodd").lower().strip()
+    if rule in ("evenodd", "even-odd", "parity"):
+        return False
+    elif rule in ("winding", "nonzero", "non-zero"):
+        return True
+    else:
+        raise ValueError(f"Unknown fill rule: {rule}")
+
+
 def lca_fill(polygon, rule="evenodd"):
     """
     Remplissage lca.
@@ -11,145 +21,283 @@ def lca_fill(polygon, rule="evenodd"):
     if len(polygon) < 3:
         return []
 
-    rule = (rule or "evenodd").lower().strip()
-    if rule in ("evenodd", "even-odd", "parity"):
-        return _fill_evenodd_lca(polygon)
-    elif rule in ("winding", "nonzero", "non-zero"):
-        return _fill_winding_scanline(polygon)
-    else:
-        raise ValueError(f"Unknown fill rule: {rule}")
-
-
-# ============================================================
-# 1) EVEN-ODD : LCA
-# ============================================================
-def _fill_evenodd_lca(polygon):
-    if len(polygon) < 3:
-        return []
-
-    leb = []
-    n = len(polygon)
-
-    for i in range(n):
-        x1, y1 = polygon[i]
-        x2, y2 = polygon[(i + 1) % n]
-
-        if y1 == y2:
-            continue
+    if _is_winding(rule):
+        return _fill_winding_lca(polygon)
+    return _fill_evenodd_lca(polygon)
 
-        if y1 < y2:
-            ymin, ymax = y1, y2
-            x_at_ymin = x1
-            dy = (y2 - y1)
-            dx = (x2 - x1) / dy
-        else:
-            ymin, ymax = y2, y1
-            x_at_ymin = x2
-            dy = (y1 - y2)
-            dx = (x1 - x2) / dy
 
-        leb.append({"ymin": ymin, "ymax": ymax, "x": x_at_ymin, "dx": dx})
-
-    if not leb:
+def lca_fill_many(contours, rule="evenodd"):
+    """
+    Remplissage de plusieurs contours en un seul balayage : toutes les arêtes
+    dans une même LEB, règle appliquée globalement (un contour dans un autre
+    = trou en pair/impair, ou s'il tourne en sens inverse en non nul ;
+    les zones de recouvrement ne sont remplies qu'une fois).
+    Contours de moins de 3 points ignorés.
+    Retour : segments (y, x1, x2) disjoints, triés par y puis x
+    (segments contigus d'une même ligne fusionnés).
+    """
+    winding = _is_winding(rule)
+    contours = [c for c in contours if len(c) >= 3]
+    if not contours:
         return []
+    return _merge_spans(_sweep(EdgeTable(contours, winding)))
 
-    leb.sort(key=lambda e: (e["ymin"], e["x"], e["dx"]))
-
-    y_start = int(math.ceil(min(e["ymin"] for e in leb)))
-    y_end   = int(math.floor(max(e["ymax"] for e in leb)))
-
-    lca = []
-    segs = []
-
-    leb_i = 0
-    leb_len = len(leb)
-
-    for y in range(y_start, y_end + 1):
-        while leb_i < leb_len and leb[leb_i]["ymin"] <= y:
-            e = leb[leb_i]
-            leb_i += 1
-
-            if y < e["ymax"]:
-                e = dict(e)
-                e["x"] = e["x"] + (y - e["ymin"]) * e["dx"]
-                lca.append(e)
-
-        lca = [e for e in lca if y < e["ymax"]]
-
-        if len(lca) >= 2:
-            lca.sort(key=lambda e: e["x"])
-            for i in range(0, len(lca) - 1, 2):
-                x1 = lca[i]["x"]
-                x2 = lca[i + 1]["x"]
-                if x2 > x1:
-                    segs.append((y, x1, x2))
 
-        for e in lca:
-            e["x"] += e["dx"]
+class SpanCache:
+    """
+    Segments de remplissage de tout un ensemble de contours (lca_fill_many),
+    rangés par ligne. update() ne rebalaye que la bande de lignes touchée
+    par une modification et remplace ces lignes dans le cache.
+    (La règle est globale : un cache par polygone ne suffirait pas, un
+    contour change le remplissage des autres.)
+    """
 
-    return segs
+    def __init__(self, contours, rule="evenodd"):
+        self.rule = rule
+        self.winding = _is_winding(rule)
+        self.rows = {}  # y -> [(y, x1, x2), ...]
+        self.refill(contours)
+
+    def refill(self, contours):
+        self.rows = {}
+        for seg in lca_fill_many(contours, self.rule):
+            self.rows.setdefault(seg[0], []).append(seg)
+
+    def update(self, contours, y_min, y_max):
+        """
+        Recalcule les lignes pouvant dépendre de [y_min, y_max] (ex. min / max
+        des sommets des arêtes modifiées, avant et après).
+        Retour : (y_lo, y_hi) lignes recalculées.
+        """
+        y_lo = int(math.floor(y_min)) - 1
+        y_hi = int(math.ceil(y_max)) + 1
+        contours = [c for c in contours if len(c) >= 3]
+        table = EdgeTable(contours, self.winding, band=(y_lo, y_hi))
+        for y in range(y_lo, y_hi + 1):
+            self.rows.pop(y, None)
+        for seg in _merge_spans(_sweep(table, y_lo, y_hi)):
+            self.rows.setdefault(seg[0], []).append(seg)
+        return y_lo, y_hi
+
+    def row(self, y):
+        return self.rows.get(y, [])
+
+    def spans(self):
+        segs = []
+        for y in sorted(self.rows):
+            segs.extend(self.rows[y])
+        return segs
+
+
+def _merge_spans(segs):
+    """Fusionne les segments qui se touchent sur une même ligne (déjà triés)."""
+    merged = []
+    for y, x1, x2 in segs:
+        if merged:
+            py, px1, px2 = merged[-1]
+            if py == y and x1 <= px2:
+                if x2 > px2:
+                    merged[-1] = (y, px1, x2)
+                continue
+        merged.append((y, x1, x2))
+    return merged
 
 
 # ============================================================
-# 2) WINDING (non-zero) : gestion polygones croisés
+# LEB compacte (colonnes) partagée par les deux règles
 # ============================================================
-def _fill_winding_scanline(polygon):
+def _first_row(v):
+    """Plus petite scanline y (entière) telle que v <= y + 0.5 (test exact)."""
+    y = math.ceil(v - 0.5)
+    # v - 0.5 peut être arrondi : on corrige d'une ligne si besoin
+    if y + 0.5 < v:
+        y += 1
+    elif y - 0.5 >= v:
+        y -= 1
+    return y
+
+
+class EdgeTable:
     """
-    Non-zero winding rule.
-    On parcourt chaque scanline, on calcule toutes les intersections (x, delta_wind),
-    on trie par x, puis on remplit les intervalles où winding != 0.
+    Arêtes non horizontales en colonnes parallèles (listes Python : un
+    array('d') recrée un float à chaque lecture, plus lent dans la boucle) :
+      ymin, ymax, x (x courant, vaut x en ymin au départ), dx (pente dx/dy),
+      x0, y0, ddx, ddy : premier sommet et x2-x1, y2-y1 dans le sens du polygone
+                         (calcul exact de x en y + 0.5 pour la règle winding),
+      wind             : +1 si l'arête monte, -1 si elle descend,
+      first, last      : première / dernière scanline où l'arête est active.
+    order : indices triés par première scanline.
+    Les scanlines sont y (evenodd, [ymin, ymax[) ou y + 0.5 (winding).
     """
-    n = len(polygon)
-    if n < 3:
-        return []
-
-    # Plage Y
-    ys = [p[1] for p in polygon]
-    y_start = int(math.floor(min(ys)))
-    y_end   = int(math.ceil(max(ys)))
-
-    segs = []
-
-    # On utilise y + 0.5 pour éviter les ambiguïtés exactes sur les sommets
-    for y in range(y_start, y_end + 1):
-        y_scan = y + 0.5
-
-        inter = []  # [(x, deltaWind), ...]
 
+    def __init__(self, contours, winding=False, band=None):
+        self.winding = winding
+        self.band = band  # (y_lo, y_hi) : seules les arêtes actives dans ces lignes
+        self.ymin = []
+        self.ymax = []
+        self.x = []
+        self.dx = []
+        self.x0 = []
+        self.y0 = []
+        self.ddx = []
+        self.ddy = []
+        self.wind = []
+        self.first = []
+        self.last = []
+
+        for polygon in contours:
+            self._add_contour(polygon)
+        self.order = sorted(range(len(self.first)), key=self.first.__getitem__)
+
+    def _add_contour(self, polygon):
+        winding = self.winding
+        n = len(polygon)
         for i in range(n):
             x1, y1 = polygon[i]
             x2, y2 = polygon[(i + 1) % n]
 
-            if y1 == y2:
+            if y1 < y2:
+                ymin, ymax, x_at_ymin, delta = y1, y2, x1, 1
+                dx = (x2 - x1) / (y2 - y1)
+            elif y1 > y2:
+                ymin, ymax, x_at_ymin, delta = y2, y1, x2, -1
+                dx = (x1 - x2) / (y1 - y2)
+            else:
                 continue  # horizontale ignorée
 
-            ymin = min(y1, y2)
-            ymax = max(y1, y2)
-
-            # convention demi-ouverte [ymin, ymax[
-            if not (ymin <= y_scan < ymax):
+            if winding:
+                first = _first_row(ymin)
+                last = _first_row(ymax) - 1
+            else:
+                first = math.ceil(ymin)
+                last = math.ceil(ymax) - 1
+            if first > last:
+                continue  # ne croise aucune scanline
+            if self.band is not None and (last < self.band[0] or first > self.band[1]):
                 continue
 
-            # intersection X
-            t = (y_scan - y1) / (y2 - y1)
-            x = x1 + t * (x2 - x1)
+            self.ymin.append(ymin)
+            self.ymax.append(ymax)
+            self.x.append(x_at_ymin)
+            self.dx.append(dx)
+            self.x0.append(x1)
+            self.y0.append(y1)
+            self.ddx.append(x2 - x1)
+            self.ddy.append(y2 - y1)
+            self.wind.append(delta)
+            self.first.append(first)
+            self.last.append(last)
 
-            # delta winding : +1 si l'arête monte, -1 si elle descend
-            delta = 1 if y2 > y1 else -1
-            inter.append((x, delta))
+    def __len__(self):
+        return len(self.first)
 
-        if len(inter) < 2:
-            continue
 
-        inter.sort(key=lambda it: it[0])
+def _sweep(table, y_lo=None, y_hi=None):
+    """
+    Balayage commun : LCA = liste d'indices dans la table, mise à jour sur
+    place (ajouts, compactage des arêtes finies, tri sur x : d'une ligne à
+    l'autre l'ordre change peu).
+    y_lo / y_hi : limite le balayage à ces lignes (mêmes valeurs de x que
+    le balayage complet).
+    Retour : liste de segments (y, x1, x2)
+    """
+    segs = []
+    if not len(table):
+        return segs
 
-        winding = 0
-        for i in range(len(inter) - 1):
-            x_i, d_i = inter[i]
-            winding += d_i
+    ymin, x, dx = table.ymin, table.x, table.dx
+    x0, y0, ddx, ddy = table.x0, table.y0, table.ddx, table.ddy
+    wind, first, last = table.wind, table.first, table.last
+    winding = table.winding
+    order = table.order
+    n = len(order)
+
+    lca = []
+    oi = 0
+    y = first[order[0]]
+    if y_lo is not None and y < y_lo:
+        y = y_lo
+
+    while (oi < n or lca) and (y_hi is None or y <= y_hi):
+        if not lca and first[order[oi]] > y:
+            y = first[order[oi]]  # rien d'actif : on saute à la prochaine arête
+
+        # entrées dans la LCA
+        while oi < n and first[order[oi]] <= y:
+            k = order[oi]
+            oi += 1
+            if not winding:
+                f = first[k]
+                x[k] = x[k] + (f - ymin[k]) * dx[k]
+                # départ de bande : mêmes additions que depuis la 1re ligne
+                for _ in range(y - f):
+                    x[k] += dx[k]
+            lca.append(k)
+
+        # sorties (compactage sur place)
+        j = 0
+        for k in lca:
+            if last[k] >= y:
+                lca[j] = k
+                j += 1
+        del lca[j:]
+
+        if winding:
+            # x exact en y + 0.5 à partir du premier sommet de l'arête
+            y_scan = y + 0.5
+            for k in lca:
+                t = (y_scan - y0[k]) / ddy[k]
+                x[k] = x0[k] + t * ddx[k]
+
+        # tri sur x : la LCA de la ligne précédente est déjà presque triée,
+        # le tri (stable, par runs) ne fait alors qu'une passe de vérification
+        lca.sort(key=x.__getitem__)
 
-            x_next = inter[i + 1][0]
-            if winding != 0 and x_next > x_i:
-                segs.append((y, x_i, x_next))
+        if len(lca) >= 2:
+            if winding:
+                w = 0
+                for i in range(len(lca) - 1):
+                    k = lca[i]
+                    w += wind[k]
+                    x_i = x[k]
+                    x_next = x[lca[i + 1]]
+                    if w != 0 and x_next > x_i:
+                        segs.append((y, x_i, x_next))
+            else:
+                for i in range(0, len(lca) - 1, 2):
+                    x1 = x[lca[i]]
+                    x2 = x[lca[i + 1]]
+                    if x2 > x1:
+                        segs.append((y, x1, x2))
+
+        if not winding:
+            for k in lca:
+                x[k] += dx[k]
+        y += 1
 
     return segs
+
+
+# ============================================================
+# 1) EVEN-ODD : LCA
+# ============================================================
+def _fill_evenodd_lca(polygon):
+    if len(polygon) < 3:
+        return []
+    return _sweep(EdgeTable([polygon]))
+
+
+# ============================================================
+# 2) WINDING (non-zero) : gestion polygones croisés
+# ============================================================
+def _fill_winding_lca(polygon):
+    """
+    Non-zero winding rule, avec LCA.
+    Scanline y + 0.5, convention demi-ouverte [ymin, ymax[ : l'arête est active
+    des lignes _first_row(ymin) à _first_row(ymax) - 1, avec son sens
+    (+1 monte, -1 descend). x est recalculé avec les extrémités d'origine
+    -> mêmes segments (y, x1, x2) qu'en testant toutes les arêtes à chaque ligne.
+    """
+    if len(polygon) < 3:
+        return []
+    return _sweep(EdgeTable([polygon], winding=True))
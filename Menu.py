@@ -376,7 +376,9 @@ class RemplissageWindow(tk.Toplevel):
         # Plusieurs polygones
         self.polygons = []         # liste de polygones fermés : [[(x,y),...], ...]
         self.current_drawing = []  # points du polygone en cours
-        self.fill_segments = []    # segments de remplissage global
+        self.fill_segments = []    # segments de remplissage global (None = à reprendre du cache)
+        self.span_cache = None     # LCA.SpanCache des polygones (lignes recalculables)
+        self.row_items = {}        # y -> ids Tk des segments de la ligne
 
         self.fill_rule = tk.StringVar(value="evenodd")
 
@@ -461,8 +463,20 @@ class RemplissageWindow(tk.Toplevel):
 
         if kind == "poly":
             poly_idx, idx = self.dragging_point[1], self.dragging_point[2]
-            self.polygons[poly_idx][idx] = (x, y)
-            self.remplir()
+            poly = self.polygons[poly_idx]
+            old = poly[idx]
+            poly[idx] = (x, y)
+            if self.span_cache is None or self.span_cache.rule != self.fill_rule.get():
+                self.remplir()
+                return
+            # seules les lignes couvertes par les deux arêtes du sommet
+            # (avant / après) changent
+            n = len(poly)
+            ys = (poly[idx - 1][1], poly[(idx + 1) % n][1], old[1], y)
+            y_lo, y_hi = self.span_cache.update(self.polygons, min(ys), max(ys))
+            # la liste complète n'est refaite qu'au prochain redraw
+            self.fill_segments = None
+            self.redraw_rows(y_lo, y_hi)
         else:
             idx = self.dragging_point[1]
             self.current_drawing[idx] = (x, y)
@@ -489,35 +503,58 @@ class RemplissageWindow(tk.Toplevel):
         if len(points) >= 2:
             for i in range(len(points) - 1):
                 self.canvas.create_line(*points[i], *points[i + 1],
-                                        fill=color, width=2, dash=dash)
+                                        fill=color, width=2, dash=dash, tags="outline")
 
         if len(points) >= 3:
             self.canvas.create_line(*points[-1], *points[0],
-                                    fill=color, width=2, dash=dash)
+                                    fill=color, width=2, dash=dash, tags="outline")
 
         for x, y in points:
             r = 4
             self.canvas.create_oval(x - r, y - r, x + r, y + r,
-                                    fill=color, outline=color)
+                                    fill=color, outline=color, tags="outline")
 
     def redraw(self):
         self.canvas.delete("all")
 
+        self.row_items = {}
+        if self.fill_segments is None:
+            self.fill_segments = self.span_cache.spans() if self.span_cache is not None else []
         for y, x1, x2 in self.fill_segments:
-            self.canvas.create_line(x1, y, x2, y, fill="orange")
+            item = self.canvas.create_line(x1, y, x2, y, fill="orange", tags="fill")
+            self.row_items.setdefault(y, []).append(item)
 
+        self.draw_outlines()
+
+    def draw_outlines(self):
         for poly in self.polygons:
             self.draw_polygon(poly, color="blue")
 
         if self.current_drawing:
             self.draw_polygon(self.current_drawing, color="gray", dash=(4, 2))
 
-    def remplir(self):
-        self.fill_segments = []
+    def redraw_rows(self, y_lo, y_hi):
+        # remplace les segments des lignes y_lo..y_hi, garde les autres
+        for y in range(y_lo, y_hi + 1):
+            items = self.row_items.pop(y, None)
+            if items:
+                self.canvas.delete(*items)
+            segs = self.span_cache.row(y)
+            if segs:
+                self.row_items[y] = [
+                    self.canvas.create_line(x1, y, x2, y, fill="orange", tags="fill")
+                    for _, x1, x2 in segs
+                ]
+
+        # contours au-dessus du remplissage
+        self.canvas.delete("outline")
+        self.draw_outlines()
 
-        for poly in self.polygons:
-            if len(poly) >= 3:
-                self.fill_segments.extend(LCA.lca_fill(poly, rule=self.fill_rule.get()))
+    def remplir(self):
+        # un seul balayage pour tous les polygones : recouvrements remplis une
+        # fois, trous selon la règle choisie
+        self.span_cache = LCA.SpanCache(self.polygons, rule=self.fill_rule.get())
+        self.fill_segments = None
 
         self.redraw()
 
@@ -525,6 +562,7 @@ class RemplissageWindow(tk.Toplevel):
         self.polygons = []
         self.current_drawing = []
         self.fill_segments = []
+        self.span_cache = None
         self.redraw()
 
 class BezierWindow(tk.Toplevel):
@@ -535,12 +573,30 @@ class BezierWindow(tk.Toplevel):
 
         # Données
         self.all_curves = [] 
+        self.all_samples = []   # points échantillonnés par courbe (None = à recalculer)
+        self.samples_key = None # réglages avec lesquels all_samples a été calculé
+        self.curve_ids = []     # identifiant stable de chaque courbe (tag Tk "c<id>")
+        self.next_curve_id = 0
+        self.versions = {}      # id -> compteur de modifs
+        self.dirty = set()      # ids des courbes à recalculer / redessiner
+        self.drawn_state = {}   # id -> (version, sélection) au dernier dessin
+        self.chain_of = {}      # id -> id du tracé à main levée dont la courbe fait partie
+        self.curve_items = {}   # id -> ligne Tk de la courbe
         self.current_curve_idx = -1 
         self.dragging_point = None 
         self.dragging_offset = (0, 0)
+        self.hit_trees = {}     # c_idx -> (points, BezierHitTree)
+        self.inter_cache = BZ.IntersectionCache()  # arbres + résultats par (id, version)
+        self.picked = None      # (c_idx, t, point) dernier clic sur une courbe
 
         self.step = tk.DoubleVar(value=0.01)
         self.use_casteljau = tk.BooleanVar(value=True)
+        self.use_matrix = tk.BooleanVar(value=BZ.np is not None)
+        self.use_adaptive = tk.BooleanVar(value=False)
+        self.tolerance = tk.DoubleVar(value=0.5)  # en pixels
+        self.show_inter = tk.BooleanVar(value=False)
+        self.freehand = tk.BooleanVar(value=False)
+        self.stroke = None      # points du tracé à main levée en cours
 
         self.create_widgets()
         self.bind_events()
@@ -551,7 +607,7 @@ class BezierWindow(tk.Toplevel):
         top.pack(side="top", fill="x", pady=5)
 
         # les instructions
-        txt = "Souris : Clic Gauche (Point) | Clic Droit (Nouv. Courbe)  ||  Clavier : Flèches (Bouger) | A/E (Rotation) | S/D (Zoom)"
+        txt = "Souris : Clic Gauche (Point) | Ctrl+Clic (Courbe) | Clic Droit (Nouv. Courbe)  ||  Clavier : Flèches (Bouger) | A/E (Rotation) | S/D (Zoom) | X (Couper)"
         ttk.Label(top, text=txt).pack(side="left", padx=5)
 
         # boutons
@@ -560,6 +616,9 @@ class BezierWindow(tk.Toplevel):
         
         # choix algo
         ttk.Checkbutton(top, text="Algo Casteljau", variable=self.use_casteljau, command=self.redraw).pack(side="left", padx=10)
+        # toute la courbe d'un coup (matrice de Bernstein, numpy)
+        if BZ.np is not None:
+            ttk.Checkbutton(top, text="Matrice", variable=self.use_matrix, command=self.redraw).pack(side="left", padx=5)
         
         # pour doubler le point
         ttk.Button(top, text="Doubler Point", command=self.duplicate_point).pack(side="left", padx=5)
@@ -573,12 +632,23 @@ class BezierWindow(tk.Toplevel):
         )
         self.slider.pack(side="left", padx=5)
 
+        # adaptatif : tolérance en pixels à la place du pas
+        ttk.Checkbutton(top, text="Adaptatif (px)", variable=self.use_adaptive, command=self.redraw).pack(side="left", padx=(10, 2))
+        ttk.Spinbox(top, from_=0.1, to=5.0, increment=0.1, width=4, textvariable=self.tolerance, command=self.redraw).pack(side="left", padx=5)
+
+        # intersections entre courbes
+        ttk.Checkbutton(top, text="Intersections", variable=self.show_inter, command=self.redraw).pack(side="left", padx=10)
+
+        # tracé à main levée -> cubiques
+        ttk.Checkbutton(top, text="Main levée", variable=self.freehand).pack(side="left", padx=5)
+
         self.canvas = tk.Canvas(self, width=1100, height=700, bg="white")
         self.canvas.pack(pady=5)
 
     def bind_events(self):
         # souris
         self.canvas.bind("<ButtonPress-1>", self.on_click_left)
+        self.canvas.bind("<Control-ButtonPress-1>", self.on_click_curve)
         self.canvas.bind("<B1-Motion>", self.on_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
         self.canvas.bind("<Button-3>", self.start_new_curve)
@@ -613,16 +683,167 @@ class BezierWindow(tk.Toplevel):
         return (x, y)
         #bernstein aussi
 
+    # suivi des modifs par courbe
+
+    def new_curve_id(self):
+        self.next_curve_id += 1
+        return self.next_curve_id
+
+    def mark_dirty(self, c_idx, resample=True):
+        uid = self.curve_ids[c_idx]
+        self.versions[uid] = self.versions.get(uid, 0) + 1
+        self.dirty.add(uid)
+        if resample:
+            self.all_samples[c_idx] = None
+
+    # tracés à main levée : les cubiques d'un même tracé bougent ensemble
+
+    def chain_members(self, c_idx):
+        # indices des courbes du même tracé (c_idx seul si pas de tracé)
+        chain = self.chain_of.get(self.curve_ids[c_idx])
+        if chain is None:
+            return [c_idx]
+        return [i for i, uid in enumerate(self.curve_ids) if self.chain_of.get(uid) == chain]
+
+    def chain_joint(self, c_idx, p_idx):
+        # extrémité p_idx de c_idx partagée avec une autre courbe du tracé :
+        # (idx voisine, indice de l'extrémité chez elle), None sinon
+        curve = self.all_curves[c_idx]
+        if p_idx not in (0, len(curve) - 1):
+            return None
+        pt = curve[p_idx]
+        for j in self.chain_members(c_idx):
+            other = self.all_curves[j]
+            if j == c_idx or len(other) < 2:
+                continue
+            if p_idx == len(curve) - 1 and other[0] == pt:
+                return (j, 0)
+            if p_idx == 0 and other[-1] == pt:
+                return (j, len(other) - 1)
+        return None
+
+    def move_point(self, c, p, nx, ny):
+        # déplace un point en gardant les raccords C0/G1 du tracé :
+        # extrémité partagée -> la voisine et les deux tangentes suivent,
+        # tangente d'un raccord -> celle d'en face reste alignée
+        curve = self.all_curves[c]
+        last = len(curve) - 1
+        ox, oy = curve[p]
+        joint = self.chain_joint(c, p) if last >= 1 else None
+        curve[p] = (nx, ny)
+        self.mark_dirty(c)
+
+        if joint is None and last >= 3:
+            # p est-il la tangente d'un raccord ?
+            if p == 1:
+                end = 0
+            elif p == last - 1:
+                end = last
+            else:
+                end = None
+            if end is not None:
+                joint = self.chain_joint(c, end)
+                if joint:
+                    j, q = joint
+                    other = self.all_curves[j]
+                    h = 1 if q == 0 else len(other) - 2
+                    if 0 < h < len(other) - 1:
+                        jx, jy = curve[end]
+                        hx, hy = other[h]
+                        dx, dy = jx - nx, jy - ny
+                        d = math.hypot(dx, dy)
+                        if d > 0:
+                            k = math.hypot(hx - jx, hy - jy) / d
+                            other[h] = (jx + dx * k, jy + dy * k)
+                            self.mark_dirty(j)
+            return
+
+        if joint is None:
+            return
+        j, q = joint
+        other = self.all_curves[j]
+        other[q] = (nx, ny)
+        dx, dy = nx - ox, ny - oy
+        # les tangentes voisines suivent la même translation (G1 gardé)
+        h = 1 if p == 0 else last - 1
+        if 0 < h < last:
+            curve[h] = (curve[h][0] + dx, curve[h][1] + dy)
+        h = 1 if q == 0 else len(other) - 2
+        if 0 < h < len(other) - 1:
+            other[h] = (other[h][0] + dx, other[h][1] + dy)
+        self.mark_dirty(j)
+
+    def update_samples(self, step_val):
+        # si un réglage a changé, tout est à recalculer
+        try:
+            tol = self.tolerance.get()
+        except:
+            tol = 0.5
+        key = (self.use_adaptive.get(), tol, self.use_matrix.get(), self.use_casteljau.get(), step_val)
+        if key != self.samples_key or len(self.all_samples) != len(self.all_curves):
+            self.samples_key = key
+            self.all_samples = [None] * len(self.all_curves)
+            self.dirty.update(self.curve_ids)
+
+        todo = [i for i, c in enumerate(self.all_curves) if self.all_samples[i] is None and len(c) >= 2]
+        if not todo:
+            return self.all_samples
+
+        # toutes les courbes d'un coup si on passe par la matrice
+        if self.use_matrix.get() and BZ.np is not None and not self.use_adaptive.get():
+            polys = BZ.bezier_polylines([self.all_curves[i] for i in todo], step_val)
+        else:
+            polys = [self.sample_curve(self.all_curves[i], step_val) for i in todo]
+        for i, pts in zip(todo, polys):
+            self.all_samples[i] = pts
+        return self.all_samples
+
+    def sample_curve(self, curve, step_val):
+        # tous les points de la courbe (curve[0] compris)
+        if self.use_adaptive.get():
+            try:
+                tol = self.tolerance.get()
+            except:
+                tol = 0.5
+            if tol <= 0: tol = 0.5
+            return BZ.bezier_polyline_adaptive(curve, tolerance=tol)
+
+        if self.use_matrix.get() and BZ.np is not None:
+            return BZ.bezier_polyline_matrix(curve, step_val)
+
+        nb_seg = int(1.0 / step_val)
+        pts = [curve[0]]
+        for i in range(1, nb_seg + 1):
+            t = i * step_val
+            if t > 1.0: t = 1.0
+
+            # Choix de l'algo
+            if self.use_casteljau.get():
+                pts.append(self.get_point_casteljau(curve, t))
+            else:
+                pts.append(self.get_point_bernstein(curve, t))
+        return pts
+
     # on attaque les courbes
 
     def start_new_curve(self, event=None):
         self.all_curves.append([])
+        self.all_samples.append(None)
+        self.curve_ids.append(self.new_curve_id())
         self.current_curve_idx = len(self.all_curves) - 1
         self.redraw()
 
+    def remove_curve(self, c_idx):
+        self.all_curves.pop(c_idx)
+        self.all_samples.pop(c_idx)
+        self.curve_ids.pop(c_idx)
+        # les courbes après c_idx changent d'indice : arbres et clic périmés
+        self.hit_trees = {i: v for i, v in self.hit_trees.items() if i < c_idx}
+        self.picked = None
+
     def delete_current_curve(self):
         if 0 <= self.current_curve_idx < len(self.all_curves):
-            self.all_curves.pop(self.current_curve_idx)
+            self.remove_curve(self.current_curve_idx)
             self.current_curve_idx = len(self.all_curves) - 1
             self.dragging_point = None
             self.redraw()
@@ -633,6 +854,7 @@ class BezierWindow(tk.Toplevel):
             if c < len(self.all_curves):
                 pt = self.all_curves[c][p]
                 self.all_curves[c].insert(p+1, pt) # on insère une copie juste après
+                self.mark_dirty(c)
                 self.redraw()
 
     # gestion souris
@@ -641,6 +863,7 @@ class BezierWindow(tk.Toplevel):
         self.canvas.focus_set() # active le clavier
         x, y = event.x, event.y
         hit = self.find_nearest(x, y)
+        self.picked = None
 
         if hit:
             # selection d'un point existant
@@ -648,37 +871,108 @@ class BezierWindow(tk.Toplevel):
             self.current_curve_idx = hit[0]
             cur_pt = self.all_curves[hit[0]][hit[1]]
             self.dragging_offset = (cur_pt[0] - x, cur_pt[1] - y)
+        elif self.freehand.get():
+            # début d'un tracé, les cubiques sont créées au relâchement
+            self.stroke = [(x, y)]
+            self.dragging_point = None
+            return
         else:
             # création nouveau point
             if not self.all_curves:
                 self.start_new_curve()
             self.all_curves[self.current_curve_idx].append((x, y))
+            self.mark_dirty(self.current_curve_idx)
             # le nouveau point devient sélectionné
             self.dragging_point = (self.current_curve_idx, len(self.all_curves[self.current_curve_idx])-1)
         self.redraw()
 
     def on_drag(self, event):
+        if self.stroke is not None:
+            px, py = self.stroke[-1]
+            self.stroke.append((event.x, event.y))
+            self.canvas.create_line(px, py, event.x, event.y, fill="orange", width=2, tags="stroke")
+            return
         if self.dragging_point:
             c, p = self.dragging_point
             if c < len(self.all_curves) and p < len(self.all_curves[c]):
                 nx = event.x + self.dragging_offset[0]
                 ny = event.y + self.dragging_offset[1]
-                self.all_curves[c][p] = (nx, ny)
+                self.move_point(c, p, nx, ny)
                 self.redraw()
 
+    # clic sur la courbe elle-même (pas sur un point)
+
+    def get_hit_tree(self, c_idx):
+        curve = self.all_curves[c_idx]
+        if len(curve) < 2:
+            return None
+        cached = self.hit_trees.get(c_idx)
+        if cached is None or cached[0] != curve:
+            cached = (curve[:], BZ.BezierHitTree(curve))
+            self.hit_trees[c_idx] = cached
+        return cached[1]
+
+    def on_click_curve(self, event):
+        self.canvas.focus_set()
+        trees = [self.get_hit_tree(i) for i in range(len(self.all_curves))]
+        hit = BZ.pick_curve(trees, event.x, event.y, radius=6)
+        if hit:
+            self.picked = hit
+            self.current_curve_idx = hit[0]
+            self.dragging_point = None
+        else:
+            self.picked = None
+        self.redraw()
+
+    def split_picked_curve(self):
+        if not self.picked: return
+        c, t, _ = self.picked
+        if c >= len(self.all_curves) or len(self.all_curves[c]) < 2: return
+        left, right = BZ.split_bezier(self.all_curves[c], t)
+        self.all_curves[c] = left
+        self.all_curves.insert(c + 1, right)
+        self.all_samples.insert(c + 1, None)
+        self.curve_ids.insert(c + 1, self.new_curve_id())
+        # la moitié droite reste dans le même tracé
+        chain = self.chain_of.get(self.curve_ids[c])
+        if chain is not None:
+            self.chain_of[self.curve_ids[c + 1]] = chain
+        self.mark_dirty(c)
+        self.hit_trees = {}
+        self.picked = None
+        self.dragging_point = None
+        self.redraw()
+
     def delete_selected_point(self):
         if self.dragging_point:
             c, p = self.dragging_point
             if c < len(self.all_curves) and p < len(self.all_curves[c]):
                 self.all_curves[c].pop(p)
+                self.mark_dirty(c)
+                if self.picked and self.picked[0] == c:
+                    self.picked = None
                 if not self.all_curves[c]: # si courbe vide, on supprime
-                    self.all_curves.pop(c)
+                    self.remove_curve(c)
                     self.current_curve_idx = len(self.all_curves) - 1
                 self.dragging_point = None
                 self.redraw()
 
     def on_release(self, event):
-        pass
+        if self.stroke is None:
+            return
+        segments = BZ.fit_stroke(self.stroke, tolerance=2.0)
+        self.stroke = None
+        # chaque cubique devient une courbe (extrémités partagées),
+        # toutes rattachées au même tracé
+        chain = self.new_curve_id()
+        for seg in segments:
+            self.all_curves.append(seg)
+            self.all_samples.append(None)
+            self.curve_ids.append(self.new_curve_id())
+            self.chain_of[self.curve_ids[-1]] = chain
+        if segments:
+            self.current_curve_idx = len(self.all_curves) - 1
+        self.redraw()
 
     # les matrices
 
@@ -694,21 +988,38 @@ class BezierWindow(tk.Toplevel):
         curve = self.all_curves[self.current_curve_idx]
         if not curve: return
 
-        cx, cy = self.get_centroid(curve)
-        new_pts = []
-        for x, y in curve:
-            #on centre
-            lx = x - cx
-            ly = y - cy
-            #on appliquer Matrice
-            nx = a*lx + b*ly
-            ny = c*lx + d*ly
-            # on remplace et translation
-            final_x = nx + cx + tx
-            final_y = ny + cy + ty
-            new_pts.append((final_x, final_y))
-        
-        self.all_curves[self.current_curve_idx] = new_pts
+        # tout le tracé à main levée bouge d'un bloc, autour d'un même centre
+        members = self.chain_members(self.current_curve_idx)
+        cx, cy = self.get_centroid([pt for i in members for pt in self.all_curves[i]])
+
+        def transform(pts):
+            new_pts = []
+            for x, y in pts:
+                #on centre
+                lx = x - cx
+                ly = y - cy
+                #on appliquer Matrice
+                nx = a*lx + b*ly
+                ny = c*lx + d*ly
+                # on remplace et translation
+                final_x = nx + cx + tx
+                final_y = ny + cy + ty
+                new_pts.append((final_x, final_y))
+            return new_pts
+
+        # Bézier est invariante par transfo affine : on transforme aussi les
+        # points déjà calculés au lieu de tout recalculer.
+        # En adaptatif la tolérance est en pixels -> seulement si pas de déformation
+        rigid = abs(a*a + c*c - 1) < 1e-9 and abs(b*b + d*d - 1) < 1e-9 and abs(a*b + c*d) < 1e-9
+        for i in members:
+            self.all_curves[i] = transform(self.all_curves[i])
+            samples = self.all_samples[i]
+            if samples is not None and (rigid or not self.use_adaptive.get()):
+                self.mark_dirty(i, resample=False)
+                self.all_samples[i] = transform(samples)
+            else:
+                self.mark_dirty(i)
+        self.picked = None
         self.redraw()
 
     def on_key_press(self, event):
@@ -746,6 +1057,9 @@ class BezierWindow(tk.Toplevel):
         # cisaillement
         elif k == 'c': self.apply_matrix(1, 0.2, 0, 1, 0, 0)
 
+        # couper la courbe au point cliqué (Ctrl+Clic)
+        elif k == 'x': self.split_picked_curve()
+
     # le dessin
 
     def find_nearest(self, x, y):
@@ -761,12 +1075,54 @@ class BezierWindow(tk.Toplevel):
 
     def clear_all(self):
         self.all_curves = []
+        self.all_samples = []
+        self.curve_ids = []
+        self.chain_of = {}
         self.current_curve_idx = -1
         self.dragging_point = None
+        self.hit_trees = {}
+        self.picked = None
         self.redraw()
 
+    def draw_curve(self, c_idx, pts, is_sel, sel_p):
+        # (re)dessine une seule courbe, tous ses items portent le tag "c<id>"
+        uid = self.curve_ids[c_idx]
+        tag = f"c{uid}"
+        curve = self.all_curves[c_idx]
+        col = "purple" if is_sel else "gray"
+        self.canvas.delete(f"{tag}&&deco")
+
+        # si pas assez de points, on dessine juste les points
+        if len(curve) < 2:
+            self.curve_items[uid] = BZ.draw_polyline_on_canvas(self.canvas, [], self.curve_items.get(uid))
+            for pt in curve:
+                self.canvas.create_oval(pt[0]-2, pt[1]-2, pt[0]+2, pt[1]+2, fill=col, tags=("deco", "top", tag))
+            return
+
+        # polygone de contrôle (Lignes grises)
+        for i in range(len(curve)-1):
+            p1, p2 = curve[i], curve[i+1]
+            self.canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="lightgray", dash=(2,2), tags=("deco", tag))
+
+        #la courbe de Bézier
+        # points calculés selon le slider, une seule ligne
+        self.curve_items[uid] = BZ.draw_polyline_on_canvas(
+            self.canvas, pts, self.curve_items.get(uid),
+            fill=col, width=2, tags=("curve", tag)
+        )
+
+        #Points de contrôle
+        for p_idx, pt in enumerate(curve):
+            is_pt_sel = (p_idx == sel_p)
+            r = 6 if is_pt_sel else 4
+            outline = "red" if is_pt_sel else "black"
+            self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline, tags=("deco", "top", tag))
+
     def redraw(self):
-        self.canvas.delete("all")
+        # seules les courbes modifiées (ou dont la sélection change) sont
+        # recalculées et redessinées, les autres gardent leurs items Tk
+        self.canvas.delete("stroke")
+        self.canvas.delete("overlay")
         
         # on recup la valeur du slider
         try:
@@ -775,45 +1131,45 @@ class BezierWindow(tk.Toplevel):
         except:
             step_val = 0.01
 
+        all_pts = self.update_samples(step_val)
+
+        # courbes supprimées
+        alive = set(self.curve_ids)
+        for uid in list(self.drawn_state):
+            if uid not in alive:
+                self.canvas.delete(f"c{uid}")
+                self.drawn_state.pop(uid)
+                self.curve_items.pop(uid, None)
+                self.versions.pop(uid, None)
+                self.chain_of.pop(uid, None)
+
         for c_idx, curve in enumerate(self.all_curves):
+            uid = self.curve_ids[c_idx]
             is_sel = (c_idx == self.current_curve_idx)
-            col = "purple" if is_sel else "gray"
-            
-            # si pas assez de points, on dessine juste les points
-            if len(curve) < 2:
-                for pt in curve:
-                    self.canvas.create_oval(pt[0]-2, pt[1]-2, pt[0]+2, pt[1]+2, fill=col)
+            sel_p = self.dragging_point[1] if self.dragging_point and self.dragging_point[0] == c_idx else None
+            state = (self.versions.get(uid, 0), is_sel, sel_p)
+            if uid not in self.dirty and self.drawn_state.get(uid) == state:
                 continue
-
-            # polygone de contrôle (Lignes grises)
-            for i in range(len(curve)-1):
-                p1, p2 = curve[i], curve[i+1]
-                self.canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="lightgray", dash=(2,2))
-
-            #la courbe de Bézier
-            # on calcule le nombre de segments selon le slider
-            nb_seg = int(1.0 / step_val)
-            prev = curve[0]
-            
-            for i in range(1, nb_seg + 1):
-                t = i * step_val
-                if t > 1.0: t = 1.0
-                
-                # Choix de l'algo
-                if self.use_casteljau.get():
-                    curr = self.get_point_casteljau(curve, t)
-                else:
-                    curr = self.get_point_bernstein(curve, t)
-                
-                self.canvas.create_line(prev[0], prev[1], curr[0], curr[1], fill=col, width=2)
-                prev = curr
-
-            #Points de contrôle
-            for p_idx, pt in enumerate(curve):
-                is_pt_sel = (self.dragging_point == (c_idx, p_idx))
-                r = 6 if is_pt_sel else 4
-                outline = "red" if is_pt_sel else "black"
-                self.canvas.create_oval(pt[0]-r, pt[1]-r, pt[0]+r, pt[1]+r, fill=col, outline=outline)
+            self.draw_curve(c_idx, all_pts[c_idx], is_sel, sel_p)
+            self.drawn_state[uid] = state
+        self.dirty.clear()
+
+        # intersections entre les courbes
+        if self.show_inter.get():
+            # seules les paires touchant une courbe modifiée sont recalculées
+            items = [(uid, self.versions.get(uid, 0), c) for uid, c in zip(self.curve_ids, self.all_curves)]
+            for _, _, _, _, (ix, iy) in self.inter_cache.intersections(items):
+                self.canvas.create_line(ix-4, iy-4, ix+4, iy+4, fill="red", width=2, tags=("overlay", "top"))
+                self.canvas.create_line(ix-4, iy+4, ix+4, iy-4, fill="red", width=2, tags=("overlay", "top"))
+
+        # point cliqué sur la courbe
+        if self.picked and self.picked[0] < len(self.all_curves):
+            px, py = self.picked[2]
+            self.canvas.create_oval(px-5, py-5, px+5, py+5, outline="red", width=2, tags=("overlay", "top"))
+
+        # ordre d'affichage : polygones < courbes < points
+        self.canvas.tag_raise("curve")
+        self.canvas.tag_raise("top")
 
 # ==================================================================
 #                               MENU